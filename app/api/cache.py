@@ -0,0 +1,56 @@
+"""
+Response caching for slow-changing API endpoints.
+Encoded bodies are kept for a short TTL and served with an ETag so clients
+can revalidate with If-None-Match and get a 304 back.
+"""
+
+from typing import Any, Awaitable, Callable
+import hashlib
+
+import orjson
+from fastapi import Request, Response
+
+from app.core.cache import TTLCache
+
+# Taxonomy values only change when indexers run
+CACHE_TTL = 60
+
+_cache = TTLCache(maxsize=64, ttl=CACHE_TTL)
+
+
+async def cached_json(
+    request: Request,
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: int = CACHE_TTL,
+) -> Response:
+    """
+    Return the cached JSON body for key, loading it on a miss.
+
+    Keys are "group" or "group?variant"; invalidate() drops whole groups.
+    """
+    entry = _cache.get(key)
+    if entry is None:
+        body = orjson.dumps(await loader())
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        entry = (body, etag)
+        _cache.set(key, entry, ttl=ttl)
+
+    body, etag = entry
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={ttl}"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def invalidate(*groups: str):
+    """Drop cached entries in the given groups, or everything if none are given."""
+    if not groups:
+        _cache.clear()
+        return
+    for key in _cache.keys():
+        if key.partition("?")[0] in groups:
+            _cache.pop(key)
@@ -1,7 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Body,
+)
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
+from datetime import datetime
+import base64
+
+import orjson
+from pydantic import TypeAdapter
 
+from app.api.cache import cached_json, invalidate
 from app.db.database import get_db
 from app.schemas.entity import (
     ContentCreate,
@@ -11,13 +25,57 @@ from app.schemas.entity import (
     StatsResponse,
     AgentResponse,
 )
+from app.services.facets import on_facets_refreshed
 from app.services.search import SearchService
-from app.services.scheduler import scheduler
+from app.services.scheduler import SWEEP, scheduler
 
 router = APIRouter(prefix="/api", tags=["search"])
 
+# Cache lifetimes: facets rarely move, the home page lists should stay fresh
+FACET_TTL = 300
+LISTING_TTL = 30
+
+# Cached responses a newly created content row can change. Stats and facet
+# responses are dropped once the facet table is rebuilt, and new content is
+# never featured, so those groups are kept
+CONTENT_CACHE_GROUPS = ("recent",)
+
+# Cached responses derived from the facet table
+FACET_CACHE_GROUPS = (
+    "content-types",
+    "platforms",
+    "tags",
+    "agent-types",
+    "facets",
+    "stats",
+)
+
+# Largest batch accepted by POST /content/bulk
+BULK_MAX_ITEMS = 1000
+
+# Validates a whole page of ORM rows in one call into pydantic-core
+_CONTENT_LIST = TypeAdapter(List[ContentResponse])
+
+
+@on_facets_refreshed
+def _drop_facet_responses():
+    invalidate(*FACET_CACHE_GROUPS)
+
+
+def _encode_cursor(content: Dict[str, Any]) -> str:
+    payload = orjson.dumps([content["indexed_at"].isoformat(), content["id"]])
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        indexed_at, content_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(indexed_at), int(content_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 
-@router.get("/search", response_model=SearchResult)
+@router.get("/search", response_model=SearchResult, response_class=ORJSONResponse)
 async def search(
     query: str = Query(..., min_length=1),
     content_type: Optional[str] = None,
@@ -27,6 +85,9 @@ async def search(
     sort_by: str = Query("relevance", pattern="^(relevance|recent|popular|liked)$"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    stream: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
     service = SearchService(db)
@@ -44,14 +105,44 @@ async def search(
         page_size=page_size,
     )
 
-    results, total = await service.search_content(search_query)
+    # NDJSON, one result per line, written as rows come off the cursor
+    if stream:
+
+        async def rows():
+            async for content in service.search_content_stream(search_query):
+                yield orjson.dumps(
+                    ContentResponse.model_validate(content).model_dump(mode="json")
+                ) + b"\n"
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    # Newest-first results page by cursor; deep page numbers without a
+    # cursor still fall back to offset paging
+    next_cursor = None
+    if sort_by == "recent" and (cursor or page == 1):
+        after = _decode_cursor(cursor) if cursor else None
+        results, total, has_more = await service.search_content_keyset(
+            search_query, after=after, include_total=include_total
+        )
+        if has_more:
+            next_cursor = _encode_cursor(results[-1])
+    else:
+        results, total, has_more = await service.search_content(
+            search_query, include_total=include_total
+        )
+
+    total_pages = None
+    if total is not None:
+        total_pages = (total + page_size - 1) // page_size
 
     return SearchResult(
-        results=[ContentResponse.model_validate(r) for r in results],
+        results=_CONTENT_LIST.validate_python(results, from_attributes=True),
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=(total + page_size - 1) // page_size if total > 0 else 0,
+        total_pages=total_pages,
+        has_more=has_more,
+        next_cursor=next_cursor,
         query=query,
     )
 
@@ -68,91 +159,155 @@ async def get_content(content_id: int, db: AsyncSession = Depends(get_db)):
 @router.post("/content", response_model=ContentResponse)
 async def create_content(content: ContentCreate, db: AsyncSession = Depends(get_db)):
     service = SearchService(db)
-    return await service.create_content(content)
+    result = await service.create_content(content)
+    if result is None:
+        raise HTTPException(status_code=409, detail="Content already exists")
+    invalidate(*CONTENT_CACHE_GROUPS)
+    return result
+
+
+@router.post("/content/bulk")
+async def create_contents_bulk(
+    contents: List[ContentCreate] = Body(..., max_length=BULK_MAX_ITEMS),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create many content items in one transaction, skipping stored URLs."""
+    service = SearchService(db)
+    indexed = await service.create_contents_bulk(contents)
+    invalidate(*CONTENT_CACHE_GROUPS)
+    return {"indexed": indexed, "skipped": len(contents) - indexed}
 
 
 @router.get("/stats", response_model=StatsResponse)
-async def get_stats(db: AsyncSession = Depends(get_db)):
+async def get_stats(request: Request, db: AsyncSession = Depends(get_db)):
     service = SearchService(db)
-    return await service.get_stats()
+    return await cached_json(request, "stats", service.get_stats)
 
 
 @router.get("/content-types", response_model=List[str])
-async def get_content_types(db: AsyncSession = Depends(get_db)):
+async def get_content_types(request: Request, db: AsyncSession = Depends(get_db)):
     service = SearchService(db)
-    return await service.get_content_types()
+    return await cached_json(
+        request, "content-types", service.get_content_types, ttl=FACET_TTL
+    )
 
 
 @router.get("/platforms", response_model=List[str])
-async def get_platforms(db: AsyncSession = Depends(get_db)):
+async def get_platforms(request: Request, db: AsyncSession = Depends(get_db)):
     service = SearchService(db)
-    return await service.get_platforms()
+    return await cached_json(request, "platforms", service.get_platforms, ttl=FACET_TTL)
 
 
 @router.get("/tags", response_model=List[str])
-async def get_tags(db: AsyncSession = Depends(get_db)):
+async def get_tags(request: Request, db: AsyncSession = Depends(get_db)):
     service = SearchService(db)
-    return await service.get_tags()
+    return await cached_json(request, "tags", service.get_tags, ttl=FACET_TTL)
 
 
 @router.get("/agent-types", response_model=List[str])
-async def get_agent_types(db: AsyncSession = Depends(get_db)):
+async def get_agent_types(request: Request, db: AsyncSession = Depends(get_db)):
+    service = SearchService(db)
+    return await cached_json(
+        request, "agent-types", service.get_agent_types, ttl=FACET_TTL
+    )
+
+
+@router.get("/facets", response_model=Dict[str, List[str]])
+async def get_facets(request: Request, db: AsyncSession = Depends(get_db)):
+    """Get every filter facet in one response."""
     service = SearchService(db)
-    return await service.get_agent_types()
+    return await cached_json(request, "facets", service.get_facets, ttl=FACET_TTL)
+
+
+def _content_list(contents) -> list:
+    return _CONTENT_LIST.dump_python(
+        _CONTENT_LIST.validate_python(contents, from_attributes=True)
+    )
 
 
 @router.get("/featured", response_model=List[ContentResponse])
 async def get_featured(
-    limit: int = Query(6, ge=1, le=20), db: AsyncSession = Depends(get_db)
+    request: Request,
+    limit: int = Query(6, ge=1, le=20),
+    db: AsyncSession = Depends(get_db),
 ):
     service = SearchService(db)
-    return await service.get_featured_content(limit)
+
+    async def load():
+        return _content_list(await service.get_featured_content(limit))
+
+    return await cached_json(request, f"featured?{limit}", load, ttl=LISTING_TTL)
 
 
 @router.get("/recent", response_model=List[ContentResponse])
 async def get_recent(
-    limit: int = Query(12, ge=1, le=50), db: AsyncSession = Depends(get_db)
+    request: Request,
+    limit: int = Query(12, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
 ):
     service = SearchService(db)
-    return await service.get_recent_content(limit)
+
+    async def load():
+        return _content_list(await service.get_recent_content(limit))
+
+    return await cached_json(request, f"recent?{limit}", load, ttl=LISTING_TTL)
 
 
 # Admin endpoints for indexing
-@router.post("/admin/index/{platform}")
-async def trigger_index(
-    platform: str,
-    limit: int = Query(50, ge=1, le=200),
-    background_tasks: BackgroundTasks = None,
-):
-    """Manually trigger indexing for a specific platform."""
-    valid_platforms = [
-        "websearch",  # Dynamic web search (DuckDuckGo, feeds)
-        "dynamic",  # HackerNews, Dev.to, Medium
-        "moltbook",  # Agent posting platforms
-        "github",  # AI repositories
-        "huggingface",  # Models and datasets
-        "civitai",  # AI art models
-        "reddit",  # AI discussions
-        "arxiv",  # Research papers
-        "youtube",  # AI videos
-    ]
-    if platform not in valid_platforms:
+VALID_PLATFORMS = [
+    "websearch",  # Dynamic web search (DuckDuckGo, feeds)
+    "dynamic",  # HackerNews, Dev.to, Medium
+    "moltbook",  # Agent posting platforms
+    "github",  # AI repositories
+    "huggingface",  # Models and datasets
+    "civitai",  # AI art models
+    "reddit",  # AI discussions
+    "arxiv",  # Research papers
+    "youtube",  # AI videos
+]
+
+
+def _check_platform(platform: str):
+    if platform not in VALID_PLATFORMS:
         raise HTTPException(
-            status_code=400, detail=f"Invalid platform. Choose from: {valid_platforms}"
+            status_code=400, detail=f"Invalid platform. Choose from: {VALID_PLATFORMS}"
         )
 
-    # Run in background
-    import asyncio
 
-    result = await scheduler.run_indexer(platform, limit=limit)
-    return {"platform": platform, "status": "completed", "result": result}
+@router.post("/admin/index/{platform}", status_code=202)
+async def trigger_index(platform: str, limit: int = Query(50, ge=1, le=200)):
+    """Manually trigger indexing for a specific platform."""
+    _check_platform(platform)
 
+    # Run in background; the scheduler holds the task until it finishes and
+    # hands back the in-flight run if this platform is already indexing
+    task = scheduler.start_indexer(platform, limit=limit)
+    task.add_done_callback(lambda _: invalidate())
+    return {"platform": platform, "status": "scheduled"}
 
-@router.post("/admin/index-all")
+
+@router.post("/admin/index-all", status_code=202)
 async def trigger_index_all(limit: int = Query(30, ge=1, le=100)):
     """Manually trigger indexing for all platforms."""
-    result = await scheduler.run_all_indexers(limit=limit)
-    return {"status": "completed", "results": result}
+    # Same as a single platform: one sweep at a time, tracked under SWEEP
+    task = scheduler.start_all_indexers(limit=limit)
+    task.add_done_callback(lambda _: invalidate())
+    return {"platform": SWEEP, "status": "scheduled"}
+
+
+@router.get("/admin/index-status/{platform}")
+async def get_index_status(platform: str):
+    """Get whether a platform, or the "all" sweep, is being indexed."""
+    if platform != SWEEP:
+        _check_platform(platform)
+    return scheduler.get_status(platform)
+
+
+@router.put("/admin/index-concurrency")
+async def set_index_concurrency(limit: int = Query(..., ge=1, le=16)):
+    """Change how many indexers a sweep runs at once, including one in progress."""
+    await scheduler.set_concurrency(limit)
+    return {"max_concurrency": scheduler.max_concurrency}
 
 
 @router.get("/admin/schedule")
@@ -162,17 +317,20 @@ async def get_schedule():
 
 
 @router.get("/platforms/available")
-async def get_available_platforms():
+async def get_available_platforms(request: Request):
     """Get list of available platforms for indexing."""
     from app.platforms.registry import PLATFORMS
 
-    return [
-        {
-            "id": p.id,
-            "name": p.name,
-            "type": p.type.value,
-            "has_api": p.has_api,
-            "icon": p.icon,
-        }
-        for p in PLATFORMS.values()
-    ]
+    async def load():
+        return [
+            {
+                "id": p.id,
+                "name": p.name,
+                "type": p.type.value,
+                "has_api": p.has_api,
+                "icon": p.icon,
+            }
+            for p in PLATFORMS.values()
+        ]
+
+    return await cached_json(request, "platforms/available", load)
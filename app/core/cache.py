@@ -0,0 +1,52 @@
+"""
+Small in-process TTL cache.
+"""
+
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import time
+
+
+class TTLCache:
+    """Dict-backed cache whose entries expire ttl seconds after being set.
+
+    set() can override the ttl for a single entry.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        if key not in self._data and len(self._data) >= self.maxsize:
+            self._evict()
+        expires_in = self.ttl if ttl is None else ttl
+        self._data[key] = (time.monotonic() + expires_in, value)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def keys(self) -> List[Hashable]:
+        return list(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+    def _evict(self):
+        # Drop expired entries first, then the oldest one if still full
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in self._data.items() if exp <= now]:
+            del self._data[key]
+        if len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
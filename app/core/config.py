@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -7,6 +9,28 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite+aiosqlite:///./agentverse.db"
     DEBUG: bool = True
 
+    # Connection pool sizing, used for client/server databases
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 30
+    DB_POOL_RECYCLE: int = 1800
+
+    # Prepared statements kept per connection
+    DB_STATEMENT_CACHE_SIZE: int = 1024
+    # Compiled SQL strings kept per engine, keyed by statement structure
+    DB_QUERY_CACHE_SIZE: int = 1200
+
+    # Indexers a full sweep runs at once; adjustable at runtime through
+    # PUT /api/admin/index-concurrency
+    INDEXER_CONCURRENCY: int = 4
+
+    # Optional platform credentials
+    GITHUB_TOKEN: Optional[str] = None
+    HF_TOKEN: Optional[str] = None
+    CIVITAI_TOKEN: Optional[str] = None
+    YOUTUBE_API_KEY: Optional[str] = None
+    REDDIT_CLIENT_ID: Optional[str] = None
+    REDDIT_CLIENT_SECRET: Optional[str] = None
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,35 @@
+"""
+Async rate limiting for outbound API calls.
+"""
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate` acquisitions per `period` seconds.
+
+    A full bucket lets `rate` callers through at once; after that they are
+    spaced `period / rate` seconds apart. Slots are reserved synchronously,
+    so concurrent callers never need a lock.
+    """
+
+    def __init__(self, rate: int, period: float = 1.0):
+        self.rate = rate
+        self.period = period
+        self._interval = period / rate
+        self._next_slot = float("-inf")
+
+    async def acquire(self):
+        now = time.monotonic()
+        slot = max(self._next_slot, now - self.period + self._interval)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info):
+        return None
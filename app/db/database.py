@@ -1,12 +1,80 @@
+from sqlalchemy import String, event, func, inspect, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+
+def _engine_url(url: str) -> str:
+    """Run plain PostgreSQL URLs on the asyncpg driver."""
+    for scheme in ("postgres://", "postgresql://"):
+        if url.startswith(scheme):
+            return "postgresql+asyncpg://" + url[len(scheme) :]
+    return url
+
+
+def _engine_options(url: str) -> dict:
+    """Pool and prepared-statement cache settings for the database driver."""
+    if url.startswith("sqlite"):
+        # SQLite keeps SQLAlchemy's default pool
+        return {"connect_args": {"cached_statements": settings.DB_STATEMENT_CACHE_SIZE}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        # Drop connections the server or a proxy closed while idle
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        # Statements prepared through asyncpg are reused on the same
+        # connection, so repeat queries skip the server-side parse and plan
+        "connect_args": {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        },
+    }
+
+
+DATABASE_URL = _engine_url(settings.DATABASE_URL)
+# Search builds its statement per request, and every combination of filters
+# and sort order is its own cache entry, so the compiled cache is sized well
+# above SQLAlchemy's default of 500
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=settings.DEBUG,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    **_engine_options(DATABASE_URL),
+)
+# Writes go through INSERT/UPDATE statements rather than session.add(), so a
+# session never holds pending objects for autoflush to push out before reads
 async_session_maker = async_sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
+    engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
 )
 
+# Connection settings for SQLite: WAL lets searches read while an indexer
+# is writing, and NORMAL sync only fsyncs at checkpoints
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -64000,
+    "mmap_size": 268435456,
+}
+
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _):
+        cursor = dbapi_conn.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def conflict_insert(table):
+    """INSERT for the configured database, with its ON CONFLICT clauses."""
+    if engine.dialect.name == "postgresql":
+        return pg_insert(table)
+    return sqlite_insert(table)
+
 
 class Base(DeclarativeBase):
     pass
@@ -20,6 +88,83 @@ async def get_db():
             await session.close()
 
 
+# Indexes replaced by composite ones in the models, or duplicating the
+# primary key, dropped from existing databases so writes don't keep
+# maintaining them
+RETIRED_INDEXES = {
+    "agents": ("ix_agents_id",),
+    "agent_contents": (
+        "ix_agent_contents_id",
+        "ix_agent_contents_content_type",
+        "ix_agent_contents_source_platform",
+        "ix_agent_contents_agent_id",
+    ),
+}
+
+
+def _blank_to_null(conn, index):
+    """Store empty strings in the index's nullable text columns as NULL."""
+    for column in index.columns:
+        if column.nullable and isinstance(column.type, String):
+            conn.execute(update(index.table).where(column == "").values({column: None}))
+
+
+def _duplicate_count(conn, index) -> int:
+    """Count rows that repeat a unique index key, beyond the first of each."""
+    columns = list(index.columns)
+    # NULLs never collide in a unique index, so those rows are left out
+    groups = (
+        select((func.count() - 1).label("extra"))
+        .select_from(index.table)
+        .where(*(column.isnot(None) for column in columns))
+        .group_by(*columns)
+        .having(func.count() > 1)
+        .subquery()
+    )
+    return conn.scalar(select(func.coalesce(func.sum(groups.c.extra), 0)))
+
+
+def _sync_indexes(conn) -> bool:
+    # create_all skips tables that already exist, so indexes added to the
+    # models later have to be created explicitly.
+    changed = False
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        missing = [index for index in table.indexes if index.name not in existing]
+        for index in missing:
+            if index.unique:
+                # Rows written before the index existed may repeat its key.
+                # Blank values mean "none" and become NULL; real duplicates
+                # are user data, so they are left for the dedupe command
+                _blank_to_null(conn, index)
+                duplicates = _duplicate_count(conn, index)
+                if duplicates:
+                    raise RuntimeError(
+                        f"{table.name} has {duplicates} rows repeating a key "
+                        f"of the new unique index {index.name}. Run "
+                        f"`python -m app.db.seed dedupe` to remove them, "
+                        f"then start the app again."
+                    )
+            # Dialect-specific indexes (ddl_if) are skipped by create()
+            index.create(conn)
+        if missing:
+            inspector.clear_cache()
+            created = {ix["name"] for ix in inspector.get_indexes(table.name)}
+            changed = changed or bool(created - existing)
+        for name in RETIRED_INDEXES.get(table.name, ()):
+            if name in existing:
+                conn.execute(text(f"DROP INDEX {name}"))
+                changed = True
+    return changed
+
+
 async def init_db():
     async with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # Trigram operator classes used by the search indexes
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
+        if await conn.run_sync(_sync_indexes):
+            # Refresh planner statistics so the new indexes get picked up
+            await conn.execute(text("ANALYZE"))
@@ -4,20 +4,64 @@ Only run this manually, not on startup.
 """
 
 import asyncio
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
 from app.db.database import async_session_maker
-from app.models.entity import Agent, AgentContent
+from app.models.entity import Agent, AgentContent, ContentFacet
 
 
 async def clear_database():
     """Clear all data from database."""
     async with async_session_maker() as session:
+        await session.execute(ContentFacet.__table__.delete())
         await session.execute(AgentContent.__table__.delete())
         await session.execute(Agent.__table__.delete())
         await session.commit()
         print("Database cleared")
 
 
+async def dedupe_contents():
+    """
+    Delete contents repeating a source_url, keeping the oldest of each.
+
+    Needed once on databases filled before source_url became unique. Empty
+    URLs are stored as NULL first, and the creation counts of agents that
+    lost rows are recomputed in the same transaction.
+    """
+    contents = AgentContent.__table__
+    agents = Agent.__table__
+    async with async_session_maker() as session:
+        await session.execute(
+            update(contents).where(contents.c.source_url == "").values(source_url=None)
+        )
+
+        keep = select(func.min(contents.c.id)).group_by(contents.c.source_url)
+        duplicate = (contents.c.source_url.isnot(None), contents.c.id.not_in(keep))
+        agent_ids = (
+            await session.scalars(
+                select(contents.c.agent_id).where(*duplicate).distinct()
+            )
+        ).all()
+        result = await session.execute(contents.delete().where(*duplicate))
+
+        if agent_ids:
+            created = (
+                select(func.count(contents.c.id))
+                .where(contents.c.agent_id == agents.c.id)
+                .scalar_subquery()
+            )
+            await session.execute(
+                update(agents)
+                .where(agents.c.id.in_(agent_ids))
+                .values(total_creations=created)
+            )
+
+        await session.commit()
+        print(
+            f"Removed {result.rowcount} duplicate contents, "
+            f"recounted {len(agent_ids)} agents"
+        )
+
+
 async def check_data():
     """Check current data in database."""
     async with async_session_maker() as session:
@@ -32,5 +76,7 @@ if __name__ == "__main__":
 
     if len(sys.argv) > 1 and sys.argv[1] == "clear":
         asyncio.run(clear_database())
+    elif len(sys.argv) > 1 and sys.argv[1] == "dedupe":
+        asyncio.run(dedupe_contents())
     else:
         asyncio.run(check_data())
@@ -4,12 +4,15 @@ arXiv indexer - indexes AI research papers.
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import httpx
-import xml.etree.ElementTree as ET
+from io import BytesIO
 import logging
+import re
 
+from lxml import etree
+
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.indexers.base import BaseIndexer
-from app.schemas.entity import ContentCreate
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +25,38 @@ AI_CATEGORIES = [
     "cs.RO",  # Robotics
 ]
 
+SEARCH_QUERY = "cat:" + " OR cat:".join(AI_CATEGORIES)
+
+# arXiv asks clients to identify themselves and not re-query rapidly, so
+# raw feeds are kept for a few minutes keyed by result limit
+USER_AGENT = f"{settings.APP_NAME.replace(' ', '-')}/{settings.APP_VERSION}"
+FEED_TTL = 300
+
+_feed_cache = TTLCache(maxsize=16, ttl=FEED_TTL)
+
+# Atom tags in Clark notation, resolved once instead of per lookup
+ATOM_NS = "http://www.w3.org/2005/Atom"
+T_ENTRY = f"{{{ATOM_NS}}}entry"
+T_TITLE = f"{{{ATOM_NS}}}title"
+T_SUMMARY = f"{{{ATOM_NS}}}summary"
+T_AUTHOR_NAME = f"{{{ATOM_NS}}}author/{{{ATOM_NS}}}name"
+T_ID = f"{{{ATOM_NS}}}id"
+T_PUBLISHED = f"{{{ATOM_NS}}}published"
+T_CATEGORY = f"{{{ATOM_NS}}}category"
+
+# Keywords that mark a paper as AI-agent related
+AI_AGENT_KEYWORDS = [
+    "agent",
+    "autonomous",
+    "llm",
+    "gpt",
+    "language model",
+    "multi-agent",
+    "reasoning",
+    "planning",
+]
+AI_AGENT_RE = re.compile("|".join(map(re.escape, AI_AGENT_KEYWORDS)), re.IGNORECASE)
+
 
 class ArxivIndexer(BaseIndexer):
     """Indexer for arXiv papers."""
@@ -39,75 +74,79 @@ class ArxivIndexer(BaseIndexer):
         """Fetch AI papers from arXiv."""
         items = []
 
-        # Build search query
-        query = "cat:" + " OR cat:".join(AI_CATEGORIES)
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
+        client = self.client
+        try:
+            feed = _feed_cache.get(limit)
+            if feed is None:
                 params = {
-                    "search_query": query,
+                    "search_query": SEARCH_QUERY,
                     "sortBy": "submittedDate",
                     "sortOrder": "descending",
                     "max_results": limit,
                 }
 
-                response = await client.get(self.base_url, params=params)
+                response = await client.get(
+                    self.base_url,
+                    params=params,
+                    headers={"User-Agent": USER_AGENT},
+                    timeout=60.0,
+                )
 
                 if response.status_code == 200:
-                    root = ET.fromstring(response.text)
-
-                    # Define namespace
-                    ns = {"atom": "http://www.w3.org/2005/Atom"}
-
-                    for entry in root.findall("atom:entry", ns):
-                        item = {}
-
-                        title_elem = entry.find("atom:title", ns)
-                        item["title"] = (
-                            title_elem.text if title_elem is not None else ""
-                        )
-
-                        summary_elem = entry.find("atom:summary", ns)
-                        item["summary"] = (
+                    feed = response.content
+                    _feed_cache.set(limit, feed)
+
+            if feed is not None:
+                # Stream entries from the raw bytes instead of building the
+                # whole tree, freeing each entry once it has been read
+                context = etree.iterparse(
+                    BytesIO(feed),
+                    events=("end",),
+                    tag=T_ENTRY,
+                    resolve_entities=False,
+                )
+
+                for _, entry in context:
+                    title_elem = entry.find(T_TITLE)
+                    summary_elem = entry.find(T_SUMMARY)
+                    id_elem = entry.find(T_ID)
+                    published_elem = entry.find(T_PUBLISHED)
+
+                    item = {
+                        "title": title_elem.text if title_elem is not None else "",
+                        "summary": (
                             summary_elem.text.strip()
                             if summary_elem is not None
                             else ""
-                        )
-
-                        # Get authors
-                        authors = []
-                        for author in entry.findall("atom:author", ns):
-                            name_elem = author.find("atom:name", ns)
-                            if name_elem is not None:
-                                authors.append(name_elem.text)
-                        item["authors"] = authors
-
-                        # Get ID
-                        id_elem = entry.find("atom:id", ns)
-                        item["id"] = id_elem.text if id_elem is not None else ""
-
-                        # Get published date
-                        published_elem = entry.find("atom:published", ns)
-                        item["published"] = (
+                        ),
+                        "authors": [
+                            name.text
+                            for name in entry.iterfind(T_AUTHOR_NAME)
+                            if name.text
+                        ],
+                        "id": id_elem.text if id_elem is not None else "",
+                        "published": (
                             published_elem.text if published_elem is not None else ""
-                        )
+                        ),
+                        "categories": [
+                            cat.get("term")
+                            for cat in entry.iterfind(T_CATEGORY)
+                            if cat.get("term")
+                        ],
+                    }
 
-                        # Get categories
-                        categories = []
-                        for cat in entry.findall("atom:category", ns):
-                            term = cat.get("term")
-                            if term:
-                                categories.append(term)
-                        item["categories"] = categories
+                    items.append(item)
 
-                        items.append(item)
+                    entry.clear()
+                    while entry.getprevious() is not None:
+                        del entry.getparent()[0]
 
-            except Exception as e:
-                logger.error(f"Error fetching from arXiv: {e}")
+        except Exception as e:
+            logger.error(f"Error fetching from arXiv: {e}")
 
         return items
 
-    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[ContentCreate]:
+    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Parse arXiv paper data."""
         if not raw_data or not raw_data.get("id"):
             return None
@@ -118,27 +157,16 @@ class ArxivIndexer(BaseIndexer):
         title = raw_data.get("title", "Untitled Paper").replace("\n", " ").strip()
         authors = raw_data.get("authors", ["Unknown"])
 
-        # Filter for AI-agent related papers
-        ai_agent_keywords = [
-            "agent",
-            "autonomous",
-            "llm",
-            "gpt",
-            "language model",
-            "multi-agent",
-            "reasoning",
-            "planning",
-        ]
-        content_lower = (title + " " + raw_data.get("summary", "")).lower()
-
         # Skip papers not related to AI agents
-        if not any(kw in content_lower for kw in ai_agent_keywords):
+        if not (
+            AI_AGENT_RE.search(title) or AI_AGENT_RE.search(raw_data.get("summary", ""))
+        ):
             return None
 
         tags = raw_data.get("categories", ["research"])[:5]
         tags.append("paper")
 
-        return ContentCreate(
+        return dict(
             agent_id_external=f"arxiv:{authors[0] if authors else 'unknown'}",
             content_type="research",
             title=title,
@@ -4,19 +4,88 @@ Each platform has its own indexer that fetches and indexes AI-generated content.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, NamedTuple
 from datetime import datetime
+from collections import OrderedDict
 import asyncio
 import logging
+import sys
 
-from sqlalchemy.ext.asyncio import AsyncSession
+import httpx
+import orjson
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.entity import Agent, AgentContent
+from app.indexers.http import get_client
+from app.models.entity import AgentContent
 from app.schemas.entity import ContentCreate
+from app.services.search import SearchService
 
 logger = logging.getLogger(__name__)
 
+# Validates a whole parsed batch in a single call into pydantic-core
+_CONTENT_LIST = TypeAdapter(List[ContentCreate])
+
+# Short labels repeated across most items of a batch. Literals in the
+# indexers are interned by the compiler already; values decoded from API
+# payloads (topics, tag lists, categories) are not.
+_INTERNED_LIST_FIELDS = ("tags", "categories")
+_INTERNED_FIELDS = ("content_type", "source_platform", "language", "license")
+
+
+def _intern_labels(fields: Dict[str, Any]):
+    """Swap repeated label strings for their interned copies in place."""
+    for key in _INTERNED_LIST_FIELDS:
+        values = fields.get(key)
+        if values:
+            fields[key] = [
+                sys.intern(value) if type(value) is str else value for value in values
+            ]
+    for key in _INTERNED_FIELDS:
+        value = fields.get(key)
+        if type(value) is str:
+            fields[key] = sys.intern(value)
+
+
+# Recently stored source URLs shared by every indexer, by canonical form, so
+# an item another indexer already wrote (a GitHub repo found via web search,
+# say) is skipped before the INSERT. The cache can't see deletes made by
+# other processes, so a hit is confirmed against the database before the
+# item is dropped.
+SEEN_URLS_MAX = 10000
+
+_seen_urls: "OrderedDict[str, str]" = OrderedDict()
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL for duplicate checks: no fragment or trailing slash."""
+    return url.split("#", 1)[0].rstrip("/")
+
+
+def _remember_urls(urls: List[str]):
+    """Record stored URLs, evicting the least recently seen past the cap."""
+    for url in urls:
+        key = canonical_url(url)
+        _seen_urls[key] = url
+        _seen_urls.move_to_end(key)
+    while len(_seen_urls) > SEEN_URLS_MAX:
+        _seen_urls.popitem(last=False)
+
+
+# Indexers fetch concurrently but write one at a time: SQLite allows a
+# single writer, and a transaction that reads before it writes can fail
+# outright rather than wait if another writer commits in between
+_write_lock = asyncio.Lock()
+
+
+class RawItem(NamedTuple):
+    """Raw platform payload tagged with the feed it came from."""
+
+    raw: Dict[str, Any]
+    source: str
+    extra: Optional[str] = None  # Per-source context: query, subreddit, kind
+
 
 class BaseIndexer(ABC):
     """Base class for all content indexers."""
@@ -28,10 +97,20 @@ class BaseIndexer(ABC):
         self.db = db
         self.stats = {"indexed": 0, "skipped": 0, "errors": 0}
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client shared by all indexers."""
+        return get_client()
+
+    @staticmethod
+    def _json(response: httpx.Response) -> Any:
+        """Decode a JSON response body with orjson."""
+        return orjson.loads(response.content)
+
     @abstractmethod
     async def fetch_content(
         self, since: Optional[datetime] = None, limit: int = 100
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Any]:
         """
         Fetch content from the platform.
 
@@ -40,73 +119,100 @@ class BaseIndexer(ABC):
             limit: Maximum number of items to fetch
 
         Returns:
-            List of raw content data from the platform
+            List of raw content data from the platform, as dicts or RawItems
         """
         pass
 
     @abstractmethod
-    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[ContentCreate]:
+    def parse_content(self, raw_data: Any) -> Optional[Dict[str, Any]]:
         """
-        Parse raw platform data into ContentCreate schema.
+        Shape raw platform data into ContentCreate fields.
+
+        Validation happens once per batch in parse_batch, so this only
+        builds a plain dict.
 
         Args:
             raw_data: Raw data from the platform API/scraper
 
         Returns:
-            ContentCreate object or None if invalid
+            Dict of ContentCreate fields or None if irrelevant
         """
         pass
 
-    async def get_or_create_agent(self, agent_id: str, name: str, **kwargs) -> Agent:
-        """Get existing agent or create a new one."""
-        stmt = select(Agent).where(Agent.agent_id == agent_id)
-        result = await self.db.execute(stmt)
-        agent = result.scalar_one_or_none()
-
-        if agent:
-            return agent
-
-        agent = Agent(agent_id=agent_id, name=name, **kwargs)
-        self.db.add(agent)
-        await self.db.flush()
-        return agent
+    def parse_batch(self, raw_items: List[Any]) -> List[ContentCreate]:
+        """Shape raw items and validate them as one list."""
+        shaped = []
+        batch_urls = set()
+        for raw_item in raw_items:
+            try:
+                fields = self.parse_content(raw_item)
+                if not fields:
+                    continue
+
+                url = canonical_url(fields.get("source_url") or "")
+                if url and url in batch_urls:
+                    self.stats["skipped"] += 1
+                    continue
+                batch_urls.add(url)
+
+                _intern_labels(fields)
+                shaped.append(fields)
+            except Exception as e:
+                logger.error(f"Error parsing item: {e}")
+                self.stats["errors"] += 1
 
-    async def content_exists(self, source_url: str) -> bool:
-        """Check if content already exists in database."""
-        stmt = select(AgentContent).where(AgentContent.source_url == source_url)
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none() is not None
-
-    async def index_content(self, content: ContentCreate) -> Optional[AgentContent]:
-        """Index a single content item."""
         try:
-            # Check for duplicates
-            if content.source_url and await self.content_exists(content.source_url):
-                self.stats["skipped"] += 1
-                return None
-
-            # Get or create agent
-            agent = await self.get_or_create_agent(
-                agent_id=content.agent_id_external, name=content.agent_id_external
+            return _CONTENT_LIST.validate_python(shaped)
+        except ValidationError:
+            pass
+
+        # Something in the batch is invalid; validate item by item so only
+        # the bad ones are dropped
+        contents = []
+        for fields in shaped:
+            try:
+                contents.append(ContentCreate.model_validate(fields))
+            except ValidationError as e:
+                logger.error(f"Error parsing item: {e}")
+                self.stats["errors"] += 1
+        return contents
+
+    async def drop_stored(self, contents: List[ContentCreate]) -> List[ContentCreate]:
+        """Drop items whose URL is cached as stored and is still in the database."""
+        cached = {}
+        for content in contents:
+            if content.source_url:
+                stored_url = _seen_urls.get(canonical_url(content.source_url))
+                if stored_url is not None:
+                    cached[id(content)] = stored_url
+        if not cached:
+            return contents
+
+        result = await self.db.execute(
+            select(AgentContent.source_url).where(
+                AgentContent.source_url.in_(set(cached.values()))
             )
+        )
+        stored = set(result.scalars())
+        for url in set(cached.values()) - stored:
+            # Deleted since it was cached; index it again
+            _seen_urls.pop(canonical_url(url), None)
 
-            # Create content
-            content_data = content.model_dump(exclude={"agent_id_external"})
-            content_data["agent_id"] = agent.id
-
-            db_content = AgentContent(**content_data)
-            self.db.add(db_content)
+        kept = [c for c in contents if cached.get(id(c)) not in stored]
+        self.stats["skipped"] += len(contents) - len(kept)
+        return kept
 
-            # Update agent's creation count
-            agent.total_creations = (agent.total_creations or 0) + 1
-
-            self.stats["indexed"] += 1
-            return db_content
+    async def index_batch(self, contents: List[ContentCreate]) -> int:
+        """
+        Index and commit a batch of content items.
 
-        except Exception as e:
-            logger.error(f"Error indexing content: {e}")
-            self.stats["errors"] += 1
-            return None
+        Returns:
+            Number of content rows inserted
+        """
+        indexed = await SearchService(self.db).create_contents_bulk(contents)
+        self.stats["indexed"] += indexed
+        self.stats["skipped"] += len(contents) - indexed
+        return indexed
 
     async def run(
         self, since: Optional[datetime] = None, limit: int = 100
@@ -127,16 +233,12 @@ class BaseIndexer(ABC):
             raw_items = await self.fetch_content(since=since, limit=limit)
             logger.info(f"Fetched {len(raw_items)} items from {self.platform_name}")
 
-            for raw_item in raw_items:
-                try:
-                    content = self.parse_content(raw_item)
-                    if content:
-                        await self.index_content(content)
-                except Exception as e:
-                    logger.error(f"Error parsing item: {e}")
-                    self.stats["errors"] += 1
+            contents = await self.drop_stored(self.parse_batch(raw_items))
+            async with _write_lock:
+                await self.index_batch(contents)
 
-            await self.db.commit()
+            # Only remember URLs once they are stored, so a failed run retries
+            _remember_urls([c.source_url for c in contents if c.source_url])
 
         except Exception as e:
             logger.error(f"Indexer error for {self.platform_name}: {e}")
@@ -4,11 +4,9 @@ Civitai indexer - indexes Stable Diffusion models and AI art.
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import httpx
 import logging
 
 from app.indexers.base import BaseIndexer
-from app.schemas.entity import ContentCreate
 
 logger = logging.getLogger(__name__)
 
@@ -30,27 +28,27 @@ class CivitaiIndexer(BaseIndexer):
         """Fetch models from Civitai."""
         items = []
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                params = {
-                    "limit": limit,
-                    "sort": "Newest",
-                }
+        client = self.client
+        try:
+            params = {
+                "limit": limit,
+                "sort": "Newest",
+            }
 
-                response = await client.get(f"{self.base_url}/models", params=params)
+            response = await client.get(f"{self.base_url}/models", params=params)
 
-                if response.status_code == 200:
-                    data = response.json()
-                    items = data.get("items", [])
-                else:
-                    logger.warning(f"Civitai returned status {response.status_code}")
+            if response.status_code == 200:
+                data = self._json(response)
+                items = data.get("items", [])
+            else:
+                logger.warning(f"Civitai returned status {response.status_code}")
 
-            except Exception as e:
-                logger.error(f"Error fetching from Civitai: {e}")
+        except Exception as e:
+            logger.error(f"Error fetching from Civitai: {e}")
 
         return items
 
-    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[ContentCreate]:
+    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Parse Civitai model data."""
         if not raw_data:
             return None
@@ -80,7 +78,7 @@ class CivitaiIndexer(BaseIndexer):
         elif model_type == "LORA":
             tags.insert(0, "lora")
 
-        return ContentCreate(
+        return dict(
             agent_id_external=f"civitai:{creator}",
             content_type=content_type,
             title=name,
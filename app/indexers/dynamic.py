@@ -5,13 +5,12 @@ Like Google - searches multiple platforms and indexes what's popular.
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import httpx
+from itertools import chain, islice
 import asyncio
 import logging
 import re
 
-from app.indexers.base import BaseIndexer
-from app.schemas.entity import ContentCreate
+from app.indexers.base import BaseIndexer, RawItem
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +33,23 @@ TRENDING_AI_TOPICS = [
     "AI video",
 ]
 
+# Single-pass, case-insensitive matcher for any trending topic
+TRENDING_RE = re.compile("|".join(map(re.escape, TRENDING_AI_TOPICS)), re.IGNORECASE)
+
+# Keywords used to filter Medium feed items
+MEDIUM_AI_KEYWORDS = ["ai", "llm", "gpt", "agent", "machine learning"]
+MEDIUM_AI_RE = re.compile("|".join(map(re.escape, MEDIUM_AI_KEYWORDS)), re.IGNORECASE)
+
+# Dev.to tags and Medium publications polled each run
+DEVTO_TAGS = ["ai", "machinelearning"]
+MEDIUM_PUBLICATIONS = ["towards-data-science", "the-generator"]
+
+# Max concurrent Hacker News item requests
+HN_CONCURRENCY = 20
+
+# Seconds before a single source is abandoned
+SOURCE_TIMEOUT = 15
+
 
 class DynamicWebIndexer(BaseIndexer):
     """
@@ -52,58 +68,73 @@ class DynamicWebIndexer(BaseIndexer):
         self, since: Optional[datetime] = None, limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Fetch content from multiple dynamic sources."""
-        items = []
-
-        # Fetch from multiple sources in parallel
-        tasks = [
-            self._fetch_hackernews(limit // 4),
-            self._fetch_devto(limit // 4),
-            self._fetch_producthunt(limit // 4),
-            self._fetch_medium(limit // 4),
+        batches = []
+
+        # Fetch from multiple sources in parallel and take each batch as
+        # soon as its source finishes
+        sources = [
+            ("hackernews", self._fetch_hackernews(limit // 4)),
+            ("devto", self._fetch_devto(limit // 4)),
+            ("producthunt", self._fetch_producthunt(limit // 4)),
+            ("medium", self._fetch_medium(limit // 4)),
         ]
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        for result in results:
-            if isinstance(result, list):
-                items.extend(result)
-            elif isinstance(result, Exception):
-                logger.error(f"Error fetching: {result}")
-
-        return items[:limit]
+        for next_done in asyncio.as_completed(
+            [self._fetch_source(name, coro) for name, coro in sources]
+        ):
+            batches.append(await next_done)
+
+        return list(islice(chain.from_iterable(batches), limit))
+
+    async def _fetch_source(self, name: str, coro) -> List[Dict[str, Any]]:
+        """Await a source fetch, giving up after SOURCE_TIMEOUT seconds."""
+        try:
+            result = await asyncio.wait_for(coro, timeout=SOURCE_TIMEOUT)
+            logger.info(f"Fetched {len(result)} items from {name}")
+            return result
+        except asyncio.TimeoutError:
+            logger.warning(f"{name} fetch timed out after {SOURCE_TIMEOUT}s")
+        except Exception as e:
+            logger.error(f"Error fetching from {name}: {e}")
+        return []
 
     async def _fetch_hackernews(self, limit: int) -> List[Dict[str, Any]]:
         """Fetch AI posts from Hacker News."""
         items = []
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                # Get top stories
-                response = await client.get(
-                    "https://hacker-news.firebaseio.com/v0/topstories.json"
-                )
-                story_ids = response.json()[: limit * 2]
-
-                for story_id in story_ids[:limit]:
-                    try:
-                        story_resp = await client.get(
-                            f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-                        )
-                        story = story_resp.json()
-
-                        if story and story.get("url") and story.get("title"):
-                            # Filter for AI-related content
-                            title = story.get("title", "").lower()
-                            if any(
-                                topic.lower() in title for topic in TRENDING_AI_TOPICS
-                            ):
-                                story["_source"] = "hackernews"
-                                items.append(story)
-                    except Exception as e:
-                        continue
+        client = self.client
+        try:
+            # Get top stories
+            response = await client.get(
+                "https://hacker-news.firebaseio.com/v0/topstories.json"
+            )
+            story_ids = self._json(response)[: limit * 2]
+
+            # Fetch stories concurrently, capped to stay polite
+            sem = asyncio.Semaphore(HN_CONCURRENCY)
+
+            async def fetch_story(story_id: int) -> Optional[Dict[str, Any]]:
+                async with sem:
+                    story_resp = await client.get(
+                        f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
+                    )
+                    return self._json(story_resp)
 
-            except Exception as e:
-                logger.error(f"HackerNews fetch error: {e}")
+            stories = await asyncio.gather(
+                *(fetch_story(story_id) for story_id in story_ids),
+                return_exceptions=True,
+            )
+
+            for story in stories:
+                if not isinstance(story, dict):
+                    continue
+                if story.get("url") and story.get("title"):
+                    # Filter for AI-related content
+                    if TRENDING_RE.search(story["title"]):
+                        items.append(RawItem(story, "hackernews"))
+
+        except Exception as e:
+            logger.error(f"HackerNews fetch error: {e}")
 
         return items
 
@@ -111,21 +142,29 @@ class DynamicWebIndexer(BaseIndexer):
         """Fetch AI articles from Dev.to."""
         items = []
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for tag in ["ai", "machinelearning", "llm", "chatgpt"][:2]:
-                try:
-                    response = await client.get(
-                        "https://dev.to/api/articles",
-                        params={"tag": tag, "per_page": limit // 2, "top": 7},
-                    )
+        client = self.client
+        responses = await asyncio.gather(
+            *(
+                client.get(
+                    "https://dev.to/api/articles",
+                    params={"tag": tag, "per_page": limit // 2, "top": 7},
+                )
+                for tag in DEVTO_TAGS
+            ),
+            return_exceptions=True,
+        )
 
-                    if response.status_code == 200:
-                        articles = response.json()
-                        for article in articles:
-                            article["_source"] = "devto"
-                            items.append(article)
-                except Exception as e:
-                    logger.error(f"Dev.to fetch error: {e}")
+        for response in responses:
+            try:
+                if isinstance(response, Exception):
+                    raise response
+
+                if response.status_code == 200:
+                    articles = self._json(response)
+                    for article in articles:
+                        items.append(RawItem(article, "devto"))
+            except Exception as e:
+                logger.error(f"Dev.to fetch error: {e}")
 
         return items
 
@@ -133,23 +172,23 @@ class DynamicWebIndexer(BaseIndexer):
         """Fetch AI products from Product Hunt via scraping."""
         items = []
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                # Product Hunt API alternative - scraping
+        client = self.client
+        try:
+            # Product Hunt API alternative - scraping
+            response = await client.get(
+                "https://www.producthunt.com/v1/posts/all",
+                params={"per_page": limit},
+                headers={"Accept": "application/json"},
+            )
+
+            # Fallback: use their public RSS-style feed
+            if response.status_code != 200:
                 response = await client.get(
-                    "https://www.producthunt.com/v1/posts/all",
-                    params={"per_page": limit},
-                    headers={"Accept": "application/json"},
+                    "https://www.producthunt.com/feed",
+                    headers={"Accept": "application/xml"},
                 )
-
-                # Fallback: use their public RSS-style feed
-                if response.status_code != 200:
-                    response = await client.get(
-                        "https://www.producthunt.com/feed",
-                        headers={"Accept": "application/xml"},
-                    )
-            except Exception as e:
-                logger.debug(f"Product Hunt not accessible: {e}")
+        except Exception as e:
+            logger.debug(f"Product Hunt not accessible: {e}")
 
         return items
 
@@ -157,62 +196,53 @@ class DynamicWebIndexer(BaseIndexer):
         """Fetch AI articles from Medium via RSS."""
         items = []
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            publications = [
-                "towards-data-science",
-                "the-generator",
-                "artificial-intelligence-news",
-            ]
-
-            for pub in publications[:2]:
-                try:
-                    # Medium's public RSS feed
-                    response = await client.get(f"https://medium.com/feed/{pub}")
-
-                    if response.status_code == 200:
-                        import xml.etree.ElementTree as ET
-
-                        root = ET.fromstring(response.text)
-
-                        ns = {"atom": "http://www.w3.org/2005/Atom"}
-
-                        for item in root.findall(".//item")[: limit // 2]:
-                            try:
-                                entry = {
-                                    "title": item.findtext("title", ""),
-                                    "link": item.findtext("link", ""),
-                                    "description": item.findtext("description", ""),
-                                    "pubDate": item.findtext("pubDate", ""),
-                                    "_source": "medium",
-                                }
-
-                                # Filter for AI content
-                                desc = entry.get("description", "").lower()
-                                title = entry.get("title", "").lower()
-                                if any(
-                                    t in title or t in desc
-                                    for t in [
-                                        "ai",
-                                        "llm",
-                                        "gpt",
-                                        "agent",
-                                        "machine learning",
-                                    ]
-                                ):
-                                    items.append(entry)
-                            except:
-                                continue
-                except Exception as e:
-                    logger.debug(f"Medium fetch error for {pub}: {e}")
+        client = self.client
+        # Medium's public RSS feeds
+        responses = await asyncio.gather(
+            *(
+                client.get(f"https://medium.com/feed/{pub}")
+                for pub in MEDIUM_PUBLICATIONS
+            ),
+            return_exceptions=True,
+        )
+
+        for pub, response in zip(MEDIUM_PUBLICATIONS, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+
+                if response.status_code == 200:
+                    import xml.etree.ElementTree as ET
+
+                    root = ET.fromstring(response.content)
+
+                    for item in root.findall(".//item")[: limit // 2]:
+                        try:
+                            entry = {
+                                "title": item.findtext("title", ""),
+                                "link": item.findtext("link", ""),
+                                "description": item.findtext("description", ""),
+                                "pubDate": item.findtext("pubDate", ""),
+                            }
+
+                            # Filter for AI content
+                            text = entry["title"] + " " + entry["description"]
+                            if MEDIUM_AI_RE.search(text):
+                                items.append(RawItem(entry, "medium"))
+                        except:
+                            continue
+            except Exception as e:
+                logger.debug(f"Medium fetch error for {pub}: {e}")
 
         return items
 
-    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[ContentCreate]:
+    def parse_content(self, item: RawItem) -> Optional[Dict[str, Any]]:
         """Parse content from various sources."""
+        raw_data = item.raw
         if not raw_data:
             return None
 
-        source = raw_data.get("_source", "unknown")
+        source = item.source
 
         if source == "hackernews":
             return self._parse_hackernews(raw_data)
@@ -223,28 +253,29 @@ class DynamicWebIndexer(BaseIndexer):
 
         return None
 
-    def _parse_hackernews(self, data: Dict) -> Optional[ContentCreate]:
+    def _parse_hackernews(self, data: Dict) -> Optional[Dict[str, Any]]:
         """Parse Hacker News story."""
         title = data.get("title", "")
         url = data.get("url", "")
         by = data.get("by", "unknown")
         score = data.get("score", 0)
+        text = data.get("text") or ""
 
         if not url:
             url = f"https://news.ycombinator.com/item?id={data.get('id')}"
 
-        return ContentCreate(
+        return dict(
             agent_id_external=f"hackernews:{by}",
             content_type="post",
             title=title,
-            description=f"Hacker News post with {score} points. {data.get('text', '')[:200] if data.get('text') else ''}",
+            description=f"Hacker News post with {score} points. {text[:200]}",
             content_url=url,
             source_platform="hackernews",
             source_url=url,
             tags=["hackernews", "community", "tech"],
         )
 
-    def _parse_devto(self, data: Dict) -> Optional[ContentCreate]:
+    def _parse_devto(self, data: Dict) -> Optional[Dict[str, Any]]:
         """Parse Dev.to article."""
         title = data.get("title", "")
         url = data.get("url", "")
@@ -252,7 +283,7 @@ class DynamicWebIndexer(BaseIndexer):
         desc = data.get("description", "") or data.get("body_markdown", "")[:500]
         tags = data.get("tag_list", ["dev"])
 
-        return ContentCreate(
+        return dict(
             agent_id_external=f"devto:{user}",
             content_type="document",
             title=title,
@@ -263,13 +294,13 @@ class DynamicWebIndexer(BaseIndexer):
             tags=tags[:10] if tags else ["dev"],
         )
 
-    def _parse_medium(self, data: Dict) -> Optional[ContentCreate]:
+    def _parse_medium(self, data: Dict) -> Optional[Dict[str, Any]]:
         """Parse Medium article."""
         title = data.get("title", "")
         url = data.get("link", "")
         desc = data.get("description", "")[:500]
 
-        return ContentCreate(
+        return dict(
             agent_id_external="medium:author",
             content_type="document",
             title=title,
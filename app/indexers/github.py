@@ -4,11 +4,12 @@ GitHub indexer - indexes AI-generated repositories and projects.
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import httpx
+import asyncio
 import logging
 
+from app.core.ratelimit import RateLimiter
 from app.indexers.base import BaseIndexer
-from app.schemas.entity import ContentCreate
+from app.indexers.http import cached_get
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +32,69 @@ AI_KEYWORDS = [
     "llm-generated",
 ]
 
+# Search API quotas: 30 requests/min with a token, 10 without
+TOKEN_SEARCH_LIMITER = RateLimiter(30, 60.0)
+ANON_SEARCH_LIMITER = RateLimiter(10, 60.0)
+
+# Repository fields parse_content reads; search results carry ~80 keys each
+REPO_FIELDS = (
+    "html_url",
+    "owner",
+    "name",
+    "full_name",
+    "topics",
+    "description",
+    "private",
+    "language",
+    "license",
+)
+
+# One aliased search per keyword, sent as a single GraphQL request. The
+# selected fields are mapped back onto the REST shape in _from_graphql.
+GRAPHQL_REPO_FRAGMENT = """
+fragment repo on Repository {
+  url
+  name
+  nameWithOwner
+  description
+  isPrivate
+  owner { login }
+  repositoryTopics(first: 10) { nodes { topic { name } } }
+  primaryLanguage { name }
+  licenseInfo { spdxId }
+}
+"""
+
+
+def _graphql_search_query(count: int, first: int) -> str:
+    """Build a query with `count` aliased repository searches, q0..qN."""
+    variables = ", ".join(f"$q{i}: String!" for i in range(count))
+    searches = "\n".join(
+        f"  q{i}: search(query: $q{i}, type: REPOSITORY, first: {first}) "
+        "{ nodes { ...repo } }"
+        for i in range(count)
+    )
+    return f"query({variables}) {{\n{searches}\n}}\n{GRAPHQL_REPO_FRAGMENT}"
+
+
+def _from_graphql(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a GraphQL repository node onto the REST search item fields."""
+    license_info = node.get("licenseInfo")
+    return {
+        "html_url": node.get("url", ""),
+        "owner": node.get("owner") or {},
+        "name": node.get("name", "unknown"),
+        "full_name": node.get("nameWithOwner"),
+        "topics": [
+            t["topic"]["name"]
+            for t in (node.get("repositoryTopics") or {}).get("nodes", [])
+        ],
+        "description": node.get("description"),
+        "private": node.get("isPrivate", False),
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "license": {"spdx_id": license_info["spdxId"]} if license_info else None,
+    }
+
 
 class GitHubIndexer(BaseIndexer):
     """Indexer for GitHub repositories."""
@@ -56,41 +120,114 @@ class GitHubIndexer(BaseIndexer):
         self, since: Optional[datetime] = None, limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Fetch AI-related repositories from GitHub."""
+        keywords = AI_KEYWORDS[:5]  # Limit keywords to avoid rate limiting
+        per_page = min(limit // len(keywords), 30)
+        since_filter = ""
+        if since:
+            since_str = since.strftime("%Y-%m-%dT%H:%M:%SZ")
+            since_filter = f" pushed:>{since_str}"
+
+        queries = [
+            f"{keyword} in:name,description,topics{since_filter}"
+            for keyword in keywords
+        ]
+
+        # GraphQL needs a token; with one, all searches share one request
+        if self.api_token:
+            items = await self._search_graphql(queries, per_page)
+        else:
+            items = await self._search_rest(queries, per_page)
+
+        return items[:limit]
+
+    async def _search_graphql(
+        self, queries: List[str], per_page: int
+    ) -> List[Dict[str, Any]]:
+        """Run all keyword searches as aliases of one GraphQL query."""
         items = []
 
-        async with httpx.AsyncClient() as client:
-            for keyword in AI_KEYWORDS[:5]:  # Limit keywords to avoid rate limiting
-                try:
-                    params = {
-                        "q": f"{keyword} in:name,description,topics",
+        try:
+            async with TOKEN_SEARCH_LIMITER:
+                response = await self.client.post(
+                    f"{self.base_url}/graphql",
+                    json={
+                        "query": _graphql_search_query(len(queries), per_page),
+                        "variables": {
+                            f"q{i}": f"{query} sort:updated-desc"
+                            for i, query in enumerate(queries)
+                        },
+                    },
+                    headers=self._get_headers(),
+                )
+
+            if response.status_code == 200:
+                payload = self._json(response)
+                for error in payload.get("errors") or []:
+                    logger.error(f"GitHub GraphQL error: {error.get('message')}")
+
+                for result in (payload.get("data") or {}).values():
+                    items.extend(
+                        _from_graphql(node)
+                        for node in (result or {}).get("nodes", [])
+                        if node
+                    )
+            elif response.status_code == 403:
+                logger.warning("GitHub rate limit reached")
+
+        except Exception as e:
+            logger.error(f"Error fetching from GitHub: {e}")
+
+        return items
+
+    async def _search_rest(
+        self, queries: List[str], per_page: int
+    ) -> List[Dict[str, Any]]:
+        """Run keyword searches against the REST search API."""
+        items = []
+
+        # Keyword searches are independent, so run them concurrently
+        responses = await asyncio.gather(
+            *(
+                cached_get(
+                    f"{self.base_url}/search/repositories",
+                    params={
+                        "q": query,
                         "sort": "updated",
                         "order": "desc",
-                        "per_page": min(limit // len(AI_KEYWORDS[:5]), 30),
-                    }
+                        "per_page": per_page,
+                    },
+                    headers=self._get_headers(),
+                    limiter=ANON_SEARCH_LIMITER,
+                )
+                for query in queries
+            ),
+            return_exceptions=True,
+        )
 
-                    if since:
-                        since_str = since.strftime("%Y-%m-%dT%H:%M:%SZ")
-                        params["q"] += f" pushed:>{since_str}"
+        rate_limited = False
+        for response in responses:
+            try:
+                if isinstance(response, Exception):
+                    raise response
 
-                    response = await client.get(
-                        f"{self.base_url}/search/repositories",
-                        params=params,
-                        headers=self._get_headers(),
+                if response.status_code == 200:
+                    data = self._json(response)
+                    items.extend(
+                        {field: repo[field] for field in REPO_FIELDS if field in repo}
+                        for repo in data.get("items", [])
                     )
+                elif response.status_code == 403:
+                    rate_limited = True
 
-                    if response.status_code == 200:
-                        data = response.json()
-                        items.extend(data.get("items", []))
-                    elif response.status_code == 403:
-                        logger.warning("GitHub rate limit reached")
-                        break
+            except Exception as e:
+                logger.error(f"Error fetching from GitHub: {e}")
 
-                except Exception as e:
-                    logger.error(f"Error fetching from GitHub: {e}")
+        if rate_limited:
+            logger.warning("GitHub rate limit reached")
 
-        return items[:limit]
+        return items
 
-    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[ContentCreate]:
+    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Parse GitHub repository data."""
         if not raw_data:
             return None
@@ -108,7 +245,7 @@ class GitHubIndexer(BaseIndexer):
         if not tags:
             tags = ["code", "repository"]
 
-        return ContentCreate(
+        return dict(
             agent_id_external=f"github:{owner}",
             content_type="code",
             title=raw_data.get("full_name", name),
@@ -0,0 +1,89 @@
+"""
+Shared HTTP client for all indexers.
+Reusing one pooled client keeps connections (and TLS sessions) alive across
+fetches and indexer runs instead of reconnecting on every call.
+Repeated GETs can go through a short-lived, revalidating response cache.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+import time
+
+import httpx
+
+from app.core.cache import TTLCache
+from app.core.ratelimit import RateLimiter
+
+# Cached GET responses are reused without a request for FRESH_TTL seconds,
+# then revalidated with their ETag / Last-Modified until RESPONSE_TTL
+FRESH_TTL = 60
+RESPONSE_TTL = 3600
+
+# Slow feeds get the full timeout, but an unreachable host fails fast
+CONNECT_TIMEOUT = 5.0
+
+_client: Optional[httpx.AsyncClient] = None
+_responses = TTLCache(maxsize=512, ttl=RESPONSE_TTL)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared HTTP client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def cached_get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    limiter: Optional[RateLimiter] = None,
+    **kwargs,
+) -> httpx.Response:
+    """
+    GET through the shared client, reusing recent successful responses.
+
+    A response younger than FRESH_TTL is returned as is; an older one is
+    revalidated with a conditional request and kept if the server answers
+    304 Not Modified. If a limiter is given, only requests that actually go
+    out wait on it.
+    """
+    client = get_client()
+    request = client.build_request("GET", url, params=params, headers=headers, **kwargs)
+    key = str(request.url)
+
+    entry: Optional[Tuple[float, httpx.Response]] = _responses.get(key)
+    if entry is not None:
+        fetched_at, cached = entry
+        if time.monotonic() - fetched_at < FRESH_TTL:
+            return cached
+
+        if "etag" in cached.headers:
+            request.headers["If-None-Match"] = cached.headers["etag"]
+        if "last-modified" in cached.headers:
+            request.headers["If-Modified-Since"] = cached.headers["last-modified"]
+
+    if limiter is not None:
+        await limiter.acquire()
+    response = await client.send(request)
+
+    if response.status_code == 304 and entry is not None:
+        _responses.set(key, (time.monotonic(), entry[1]))
+        return entry[1]
+
+    if response.status_code == 200:
+        _responses.set(key, (time.monotonic(), response))
+
+    return response
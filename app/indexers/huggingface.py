@@ -4,14 +4,37 @@ Hugging Face indexer - indexes AI models, datasets, and spaces.
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import httpx
+from itertools import chain, islice
+import asyncio
 import logging
 
-from app.indexers.base import BaseIndexer
-from app.schemas.entity import ContentCreate
+from app.indexers.base import BaseIndexer, RawItem
+from app.indexers.http import cached_get
 
 logger = logging.getLogger(__name__)
 
+# Fields parse_content reads; requesting only these via `expand` instead of
+# `full=true` keeps siblings, configs and widget data out of the payload
+MODEL_FIELDS = ["author", "tags", "cardData"]
+DATASET_FIELDS = ["author", "tags", "cardData", "description"]
+
+# Fixed query params; only the limit changes per call
+MODEL_PARAMS = {"expand": MODEL_FIELDS, "sort": "downloads", "direction": "-1"}
+DATASET_PARAMS = {"expand": DATASET_FIELDS, "sort": "downloads", "direction": "-1"}
+
+# Keys kept from each decoded item; cardData can still hold large model-index
+# and widget blocks, so only the parts parse_content reads are carried over
+ITEM_KEYS = ("id", "author", "tags", "description")
+CARD_KEYS = ("description", "license")
+
+
+def _slim(item: Dict[str, Any], content_type: str) -> RawItem:
+    slim = {key: item[key] for key in ITEM_KEYS if key in item}
+    card = item.get("cardData")
+    if card:
+        slim["cardData"] = {key: card[key] for key in CARD_KEYS if key in card}
+    return RawItem(slim, "huggingface", content_type)
+
 
 class HuggingFaceIndexer(BaseIndexer):
     """Indexer for Hugging Face models and datasets."""
@@ -34,62 +57,61 @@ class HuggingFaceIndexer(BaseIndexer):
         self, since: Optional[datetime] = None, limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Fetch models from Hugging Face."""
-        items = []
-
-        async with httpx.AsyncClient() as client:
-            # Fetch trending models
-            try:
-                response = await client.get(
-                    f"{self.base_url}/models",
-                    params={
-                        "limit": limit,
-                        "full": "true",
-                        "sort": "downloads",
-                        "direction": "-1",
-                    },
-                    headers=self._get_headers(),
-                )
+        batches = []
+
+        # Models and datasets are independent, so request both at once
+        headers = self._get_headers()
+        models_resp, datasets_resp = await asyncio.gather(
+            cached_get(
+                f"{self.base_url}/models",
+                params={**MODEL_PARAMS, "limit": limit},
+                headers=headers,
+            ),
+            cached_get(
+                f"{self.base_url}/datasets",
+                params={**DATASET_PARAMS, "limit": limit // 2},
+                headers=headers,
+            ),
+            return_exceptions=True,
+        )
+
+        # Fetch trending models
+        try:
+            if isinstance(models_resp, Exception):
+                raise models_resp
 
-                if response.status_code == 200:
-                    models = response.json()
-                    for model in models:
-                        model["_content_type"] = "model"
-                        items.append(model)
-
-            except Exception as e:
-                logger.error(f"Error fetching models from HuggingFace: {e}")
-
-            # Fetch trending datasets
-            try:
-                response = await client.get(
-                    f"{self.base_url}/datasets",
-                    params={
-                        "limit": limit // 2,
-                        "full": "true",
-                        "sort": "downloads",
-                        "direction": "-1",
-                    },
-                    headers=self._get_headers(),
+            if models_resp.status_code == 200:
+                batches.append(
+                    _slim(model, "model") for model in self._json(models_resp)
                 )
 
-                if response.status_code == 200:
-                    datasets = response.json()
-                    for dataset in datasets:
-                        dataset["_content_type"] = "dataset"
-                        items.append(dataset)
+        except Exception as e:
+            logger.error(f"Error fetching models from HuggingFace: {e}")
+
+        # Fetch trending datasets
+        try:
+            if isinstance(datasets_resp, Exception):
+                raise datasets_resp
+
+            if datasets_resp.status_code == 200:
+                batches.append(
+                    _slim(dataset, "dataset") for dataset in self._json(datasets_resp)
+                )
 
-            except Exception as e:
-                logger.error(f"Error fetching datasets from HuggingFace: {e}")
+        except Exception as e:
+            logger.error(f"Error fetching datasets from HuggingFace: {e}")
 
-        return items[:limit]
+        # Slim lazily and stop at limit instead of building and slicing
+        return list(islice(chain.from_iterable(batches), limit))
 
-    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[ContentCreate]:
+    def parse_content(self, item: RawItem) -> Optional[Dict[str, Any]]:
         """Parse HuggingFace model/dataset data."""
+        raw_data = item.raw
         if not raw_data:
             return None
 
         model_id = raw_data.get("id", "")
-        content_type = raw_data.get("_content_type", "model")
+        content_type = item.extra or "model"
         author = raw_data.get("author", "unknown")
 
         # Build URL
@@ -109,7 +131,7 @@ class HuggingFaceIndexer(BaseIndexer):
             "description", ""
         )
 
-        return ContentCreate(
+        return dict(
             agent_id_external=f"huggingface:{author}",
             content_type=content_type,
             title=model_id,
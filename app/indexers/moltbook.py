@@ -5,16 +5,20 @@ Real-time indexing of agent-generated content.
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from itertools import chain, islice
+import feedparser
 import httpx
 import asyncio
 import logging
-import json
 
-from app.indexers.base import BaseIndexer
-from app.schemas.entity import ContentCreate
+from app.indexers.base import BaseIndexer, RawItem
 
 logger = logging.getLogger(__name__)
 
+# Public Nitter instance mirroring Twitter/X timelines
+NITTER_URL = "https://nitter.net"
+TWITTER_ACCOUNTS = ["autogpt", "crewaiinc", "langchainai", "anthropicai", "openai"]
+
 
 class MoltbookIndexer(BaseIndexer):
     """
@@ -33,78 +37,85 @@ class MoltbookIndexer(BaseIndexer):
         self, since: Optional[datetime] = None, limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Fetch posts from Moltbook or similar platforms."""
-        items = []
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Try Moltbook API
-            try:
-                response = await client.get(
-                    f"{self.api_url}/posts",
-                    params={"limit": limit, "sort": "popular", "type": "agent"},
-                )
+        client = self.client
+        # Moltbook API, with Twitter/X and Bluesky as fallbacks, fetched together
+        results = await asyncio.gather(
+            self._fetch_moltbook_posts(client, limit),
+            self._fetch_twitter_ai_posts(client, limit // 2),
+            self._fetch_bluesky_posts(client, limit // 2),
+            return_exceptions=True,
+        )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    for post in data.get(
-                        "posts", data if isinstance(data, list) else []
-                    ):
-                        post["_source"] = "moltbook"
-                        items.append(post)
-            except Exception as e:
-                logger.debug(f"Moltbook API not available: {e}")
+        batches = []
+        for source, result in zip(("Moltbook", "Twitter", "Bluesky"), results):
+            if isinstance(result, Exception):
+                logger.debug(f"{source} fetch error: {result}")
+                continue
+            batches.append(result)
 
-            # Fallback: Index from Twitter/X API for AI agents
-            try:
-                twitter_items = await self._fetch_twitter_ai_posts(client, limit // 2)
-                items.extend(twitter_items)
-            except Exception as e:
-                logger.debug(f"Twitter fetch error: {e}")
+        return list(islice(chain.from_iterable(batches), limit))
 
-            # Fallback: Index from Bluesky for AI posts
-            try:
-                bluesky_items = await self._fetch_bluesky_posts(client, limit // 2)
-                items.extend(bluesky_items)
-            except Exception as e:
-                logger.debug(f"Bluesky fetch error: {e}")
+    async def _fetch_moltbook_posts(
+        self, client: httpx.AsyncClient, limit: int
+    ) -> List[Dict]:
+        """Fetch agent posts from the Moltbook API."""
+        items = []
 
-        return items[:limit]
+        try:
+            response = await client.get(
+                f"{self.api_url}/posts",
+                params={"limit": limit, "sort": "popular", "type": "agent"},
+            )
+
+            if response.status_code == 200:
+                data = self._json(response)
+                for post in data.get("posts", data if isinstance(data, list) else []):
+                    items.append(RawItem(post, "moltbook"))
+        except Exception as e:
+            logger.debug(f"Moltbook API not available: {e}")
+
+        return items
 
     async def _fetch_twitter_ai_posts(
         self, client: httpx.AsyncClient, limit: int
     ) -> List[Dict]:
-        """Fetch AI agent posts from Twitter/X public API."""
+        """Fetch AI agent posts from Twitter/X via Nitter RSS feeds."""
         items = []
 
-        # Twitter's public search API (no auth needed for public tweets)
-        # Using Nitter as a fallback for scraping
-        try:
-            # Search for AI agent related accounts/posts
-            accounts = ["autogpt", "crewaiinc", "langchainai", "anthropicai", "openai"]
-
-            for account in accounts[:3]:
-                try:
-                    # Use Nitter instance for public Twitter data
-                    response = await client.get(
-                        f"https://nitter.net/{account}",
-                        headers={"User-Agent": "Mozilla/5.0"},
-                    )
-
-                    if response.status_code == 200:
-                        # Parse HTML for tweet content
-                        # This is a simplified parser
-                        items.append(
-                            {
-                                "title": f"Latest from @{account}",
-                                "content": f"AI agent posts from {account}",
-                                "url": f"https://x.com/{account}",
-                                "author": account,
-                                "_source": "twitter",
-                            }
-                        )
-                except:
-                    continue
-        except Exception as e:
-            logger.debug(f"Twitter/Nitter fetch error: {e}")
+        # Nitter serves each account's timeline as RSS, so posts can be read
+        # without scraping HTML
+        accounts = TWITTER_ACCOUNTS[:3]
+        per_account = max(limit // len(accounts), 1)
+        responses = await asyncio.gather(
+            *(
+                client.get(
+                    f"{NITTER_URL}/{account}/rss",
+                    headers={"User-Agent": "Mozilla/5.0"},
+                )
+                for account in accounts
+            ),
+            return_exceptions=True,
+        )
+
+        for account, response in zip(accounts, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+
+                if response.status_code == 200:
+                    feed = feedparser.parse(response.content)
+                    for entry in feed.entries[:per_account]:
+                        # Point links at the original post rather than the mirror
+                        link = entry.get("link", "").split("#")[0]
+                        post = {
+                            "content": entry.get("title", ""),
+                            "url": link.replace(NITTER_URL, "https://x.com", 1),
+                            "author": account,
+                        }
+                        items.append(RawItem(post, "twitter"))
+            except Exception as e:
+                logger.debug(f"Nitter fetch error for {account}: {e}")
 
         return items
 
@@ -122,21 +133,21 @@ class MoltbookIndexer(BaseIndexer):
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 for post in data.get("posts", []):
-                    post["_source"] = "bluesky"
-                    items.append(post)
+                    items.append(RawItem(post, "bluesky"))
         except Exception as e:
             logger.debug(f"Bluesky fetch error: {e}")
 
         return items
 
-    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[ContentCreate]:
+    def parse_content(self, item: RawItem) -> Optional[Dict[str, Any]]:
         """Parse content from agent platforms."""
+        raw_data = item.raw
         if not raw_data:
             return None
 
-        source = raw_data.get("_source", "moltbook")
+        source = item.source
 
         if source == "bluesky":
             return self._parse_bluesky(raw_data)
@@ -145,14 +156,15 @@ class MoltbookIndexer(BaseIndexer):
         else:
             return self._parse_moltbook(raw_data)
 
-    def _parse_moltbook(self, data: Dict) -> Optional[ContentCreate]:
+    def _parse_moltbook(self, data: Dict) -> Optional[Dict[str, Any]]:
         """Parse Moltbook post."""
         author = data.get("author", data.get("agent_name", "unknown"))
-        title = data.get("title", data.get("content", "")[:100])
+        # Only cut a fallback title from the content when there is no title
+        title = data["title"] if "title" in data else data.get("content", "")[:100]
         content = data.get("content", data.get("body", ""))
         url = data.get("url", data.get("link", ""))
 
-        return ContentCreate(
+        return dict(
             agent_id_external=f"moltbook:{author}",
             content_type="post",
             title=title,
@@ -163,13 +175,13 @@ class MoltbookIndexer(BaseIndexer):
             tags=data.get("tags", ["agent", "post"]),
         )
 
-    def _parse_bluesky(self, data: Dict) -> Optional[ContentCreate]:
+    def _parse_bluesky(self, data: Dict) -> Optional[Dict[str, Any]]:
         """Parse Bluesky post."""
         record = data.get("record", {})
         author = data.get("author", {}).get("handle", "unknown")
         text = record.get("text", "")
 
-        return ContentCreate(
+        return dict(
             agent_id_external=f"bluesky:{author}",
             content_type="post",
             title=text[:100] if text else "Bluesky post",
@@ -180,13 +192,13 @@ class MoltbookIndexer(BaseIndexer):
             tags=["bluesky", "social", "agent"],
         )
 
-    def _parse_twitter(self, data: Dict) -> Optional[ContentCreate]:
+    def _parse_twitter(self, data: Dict) -> Optional[Dict[str, Any]]:
         """Parse Twitter/X post."""
         author = data.get("author", "unknown")
         content = data.get("content", data.get("text", ""))
         url = data.get("url", f"https://x.com/{author}")
 
-        return ContentCreate(
+        return dict(
             agent_id_external=f"twitter:{author}",
             content_type="post",
             title=content[:100] if content else f"Post by @{author}",
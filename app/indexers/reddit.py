@@ -4,11 +4,13 @@ Reddit indexer - indexes AI agent discussions and posts.
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import httpx
+import asyncio
 import logging
+import re
 
-from app.indexers.base import BaseIndexer
-from app.schemas.entity import ContentCreate
+from app.core.ratelimit import RateLimiter
+from app.indexers.base import BaseIndexer, RawItem
+from app.indexers.http import cached_get
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,26 @@ AI_SUBREDDITS = [
     "SillyTavernAI",
 ]
 
+REDDIT_BASE_URL = "https://www.reddit.com"
+
+# (subreddit, listing URL) pairs polled each run
+SUBREDDIT_URLS = [(s, f"{REDDIT_BASE_URL}/r/{s}/hot.json") for s in AI_SUBREDDITS[:5]]
+
+# Reddit allows about 60 requests/min per client
+LIMITER = RateLimiter(60, 60.0)
+
+# Keywords that mark a post as AI related, matched anywhere in the text
+AI_KEYWORDS = ["ai", "agent", "gpt", "llm", "autonomous", "generated", "bot"]
+AI_KEYWORD_RE = re.compile("|".join(map(re.escape, AI_KEYWORDS)), re.IGNORECASE)
+
+
+def _is_relevant(post: Dict[str, Any]) -> bool:
+    """Whether a post mentions an AI keyword, checking the short title first."""
+    return bool(
+        AI_KEYWORD_RE.search(post.get("title", ""))
+        or AI_KEYWORD_RE.search(post.get("selftext", ""))
+    )
+
 
 class RedditIndexer(BaseIndexer):
     """Indexer for Reddit posts."""
@@ -39,7 +61,7 @@ class RedditIndexer(BaseIndexer):
         super().__init__(db)
         self.client_id = client_id
         self.client_secret = client_secret
-        self.base_url = "https://www.reddit.com"
+        self.base_url = REDDIT_BASE_URL
 
     def _get_headers(self) -> Dict[str, str]:
         return {"User-Agent": "AgentVerse-Search/1.0"}
@@ -50,46 +72,52 @@ class RedditIndexer(BaseIndexer):
         """Fetch posts from AI subreddits."""
         items = []
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for subreddit in AI_SUBREDDITS[:5]:
-                try:
-                    response = await client.get(
-                        f"{self.base_url}/r/{subreddit}/hot.json",
-                        params={"limit": limit // len(AI_SUBREDDITS[:5])},
-                        headers=self._get_headers(),
+        params = {"limit": limit // len(SUBREDDIT_URLS)}
+        headers = self._get_headers()
+        responses = await asyncio.gather(
+            *(
+                cached_get(url, params=params, headers=headers, limiter=LIMITER)
+                for _, url in SUBREDDIT_URLS
+            ),
+            return_exceptions=True,
+        )
+
+        rate_limited = False
+        for (subreddit, _), response in zip(SUBREDDIT_URLS, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+
+                if response.status_code == 200:
+                    data = self._json(response)
+                    posts = data.get("data", {}).get("children", [])
+                    # Drop off-topic posts here so they never reach parsing
+                    items.extend(
+                        RawItem(post_data, "reddit", subreddit)
+                        for post_data in (post.get("data", {}) for post in posts)
+                        if _is_relevant(post_data)
                     )
+                elif response.status_code == 429:
+                    rate_limited = True
 
-                    if response.status_code == 200:
-                        data = response.json()
-                        posts = data.get("data", {}).get("children", [])
-                        for post in posts:
-                            post_data = post.get("data", {})
-                            post_data["_subreddit"] = subreddit
-                            items.append(post_data)
-                    elif response.status_code == 429:
-                        logger.warning("Reddit rate limited")
-                        break
+            except Exception as e:
+                logger.error(f"Error fetching from Reddit r/{subreddit}: {e}")
 
-                except Exception as e:
-                    logger.error(f"Error fetching from Reddit r/{subreddit}: {e}")
+        if rate_limited:
+            logger.warning("Reddit rate limited")
 
         return items[:limit]
 
-    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[ContentCreate]:
+    def parse_content(self, item: RawItem) -> Optional[Dict[str, Any]]:
         """Parse Reddit post data."""
+        raw_data = item.raw
         if not raw_data:
             return None
 
-        # Filter: only AI-generated content or agent discussions
+        # Off-topic posts were already dropped in fetch_content
         title = raw_data.get("title", "")
         self_text = raw_data.get("selftext", "")
-        subreddit = raw_data.get("_subreddit", "unknown")
-
-        # Skip if not relevant
-        ai_keywords = ["ai", "agent", "gpt", "llm", "autonomous", "generated", "bot"]
-        content_lower = (title + " " + self_text).lower()
-        if not any(kw in content_lower for kw in ai_keywords):
-            return None
+        subreddit = item.extra or "unknown"
 
         author = raw_data.get("author", "unknown")
         post_id = raw_data.get("id", "")
@@ -102,7 +130,7 @@ class RedditIndexer(BaseIndexer):
         if raw_data.get("link_flair_text"):
             tags.append(raw_data["link_flair_text"].lower())
 
-        return ContentCreate(
+        return dict(
             agent_id_external=f"reddit:{author}",
             content_type="post",
             title=title,
@@ -5,13 +5,14 @@ Uses DuckDuckGo and other search APIs to find content dynamically.
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from itertools import chain, islice
 import httpx
 import asyncio
 import logging
-import urllib.parse
+import re
 
-from app.indexers.base import BaseIndexer
-from app.schemas.entity import ContentCreate
+from app.core.ratelimit import RateLimiter
+from app.indexers.base import BaseIndexer, RawItem
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,31 @@ SEARCH_QUERIES = [
     "agent workflow automation",
 ]
 
+# URL markers mapped to content types, in priority order: a URL holding
+# several markers takes the type of the first one listed. One regex pass
+# finds the markers present (none overlaps another, so finditer sees all).
+URL_CONTENT_TYPES = {
+    "youtube.com": "video",
+    "vimeo.com": "video",
+    "github.com": "code",
+    "arxiv.org": "research",
+    "medium.com": "document",
+    "blog": "document",
+}
+URL_CONTENT_TYPE_RE = re.compile("|".join(map(re.escape, URL_CONTENT_TYPES)))
+
+# Host part of a URL, without a leading "www."
+URL_DOMAIN_RE = re.compile(r"//(?:www\.)?([^/?#]+)")
+
+# Reader-API feed blocks: a "Title:" line and everything up to the next one
+FEED_ITEM_RE = re.compile(r"^Title:(.*)((?:\n(?!Title:).*)*)", re.MULTILINE)
+FEED_URL_RE = re.compile(r"^URL:(.*)", re.MULTILINE)
+FEED_DESC_RE = re.compile(r"^(?!URL:)(.+)", re.MULTILINE)
+
+# Max DuckDuckGo requests in flight at once, and per second
+DDG_CONCURRENCY = 3
+DDG_LIMITER = RateLimiter(5, 1.0)
+
 
 class WebSearchIndexer(BaseIndexer):
     """
@@ -46,28 +72,30 @@ class WebSearchIndexer(BaseIndexer):
         Search the web for AI-related content.
         Uses multiple search APIs to find relevant content.
         """
-        items = []
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Use DuckDuckGo Instant Answer API (free, no auth)
-            for query in SEARCH_QUERIES[:5]:
-                try:
-                    search_items = await self._search_duckduckgo(
-                        client, query, limit // 5
-                    )
-                    items.extend(search_items)
-                    await asyncio.sleep(0.5)  # Rate limiting
-                except Exception as e:
-                    logger.error(f"Search error for '{query}': {e}")
-
-        # Also fetch from discovery APIs
-        try:
-            discovery_items = await self._fetch_discovery_feeds(client, limit // 2)
-            items.extend(discovery_items)
-        except Exception as e:
-            logger.debug(f"Discovery fetch error: {e}")
+        client = self.client
+        # Use DuckDuckGo Instant Answer API (free, no auth), a few queries
+        # at a time, alongside the discovery feeds
+        sem = asyncio.Semaphore(DDG_CONCURRENCY)
 
-        return items[:limit]
+        async def search(query: str) -> List[Dict]:
+            async with sem:
+                return await self._search_duckduckgo(client, query, limit // 5)
+
+        results = await asyncio.gather(
+            *(search(query) for query in SEARCH_QUERIES[:5]),
+            self._fetch_discovery_feeds(client, limit // 2),
+            return_exceptions=True,
+        )
+
+        batches = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Web search error: {result}")
+                continue
+            batches.append(result)
+
+        return list(islice(chain.from_iterable(batches), limit))
 
     async def _search_duckduckgo(
         self, client: httpx.AsyncClient, query: str, limit: int
@@ -80,38 +108,33 @@ class WebSearchIndexer(BaseIndexer):
 
         try:
             # DuckDuckGo Instant Answer API
+            await DDG_LIMITER.acquire()
             response = await client.get(
                 "https://api.duckduckgo.com/",
                 params={"q": query, "format": "json", "no_html": 1, "skip_disambig": 1},
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
 
                 # Related topics
                 for topic in data.get("RelatedTopics", [])[:limit]:
                     if isinstance(topic, dict) and topic.get("FirstURL"):
-                        items.append(
-                            {
-                                "title": topic.get("Text", "")[:200],
-                                "url": topic.get("FirstURL", ""),
-                                "description": topic.get("Text", ""),
-                                "_source": "duckduckgo",
-                                "_query": query,
-                            }
-                        )
+                        result = {
+                            "title": topic.get("Text", "")[:200],
+                            "url": topic.get("FirstURL", ""),
+                            "description": topic.get("Text", ""),
+                        }
+                        items.append(RawItem(result, "duckduckgo", query))
 
                 # Abstract
                 if data.get("Abstract"):
-                    items.append(
-                        {
-                            "title": data.get("Heading", query),
-                            "url": data.get("AbstractURL", ""),
-                            "description": data.get("Abstract", ""),
-                            "_source": "duckduckgo",
-                            "_query": query,
-                        }
-                    )
+                    result = {
+                        "title": data.get("Heading", query),
+                        "url": data.get("AbstractURL", ""),
+                        "description": data.get("Abstract", ""),
+                    }
+                    items.append(RawItem(result, "duckduckgo", query))
         except Exception as e:
             logger.debug(f"DuckDuckGo search error: {e}")
 
@@ -133,73 +156,69 @@ class WebSearchIndexer(BaseIndexer):
             ),
         ]
 
-        for feed_url, source in feeds[:2]:
+        # Fetch the feeds concurrently via the Jina AI reader API, which
+        # returns clean content
+        selected = feeds[:2]
+        responses = await asyncio.gather(
+            *(client.get(feed_url) for feed_url, _ in selected),
+            return_exceptions=True,
+        )
+
+        for (_, source), response in zip(selected, responses):
             try:
-                # Use Jina AI reader API to get clean content
-                response = await client.get(feed_url)
+                if isinstance(response, Exception):
+                    raise response
 
                 if response.status_code == 200:
-                    # Parse the simplified content
-                    content = response.text
-
-                    # Extract articles (simplified parsing)
-                    lines = content.split("\n")
-                    current_item = {}
-
-                    for line in lines:
-                        if line.startswith("Title:"):
-                            if current_item.get("title"):
-                                current_item["_source"] = source
-                                items.append(current_item)
-                            current_item = {"title": line[6:].strip()}
-                        elif line.startswith("URL:"):
-                            current_item["url"] = line[4:].strip()
-                        elif current_item.get("title") and not current_item.get(
-                            "description"
-                        ):
-                            current_item["description"] = line[:500]
-
-                    if current_item.get("title"):
-                        current_item["_source"] = source
-                        items.append(current_item)
+                    # Extract articles from the simplified content: each
+                    # "Title:" block carries a "URL:" line and a description
+                    for match in FEED_ITEM_RE.finditer(response.text):
+                        title = match[1].strip()
+                        if not title:
+                            continue
+
+                        body = match[2]
+                        url_match = FEED_URL_RE.search(body)
+                        desc_match = FEED_DESC_RE.search(body)
+                        article = {
+                            "title": title,
+                            "url": url_match[1].strip() if url_match else "",
+                            "description": desc_match[1][:500] if desc_match else "",
+                        }
+                        items.append(RawItem(article, source))
 
             except Exception as e:
                 logger.debug(f"Feed fetch error for {source}: {e}")
 
         return items[:limit]
 
-    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[ContentCreate]:
+    def parse_content(self, item: RawItem) -> Optional[Dict[str, Any]]:
         """Parse search results into content."""
+        raw_data = item.raw
         if not raw_data:
             return None
 
-        source = raw_data.get("_source", "web")
+        source = item.source
         title = raw_data.get("title", "")
         url = raw_data.get("url", "")
         description = raw_data.get("description", "")
-        query = raw_data.get("_query", "ai")
+        query = item.extra or "ai"
 
         if not url or not title:
             return None
 
         # Determine content type from URL
-        content_type = "post"
-        if "youtube.com" in url or "vimeo.com" in url:
-            content_type = "video"
-        elif "github.com" in url:
-            content_type = "code"
-        elif "arxiv.org" in url:
-            content_type = "research"
-        elif "medium.com" in url or "blog" in url:
-            content_type = "document"
+        markers = {match[0] for match in URL_CONTENT_TYPE_RE.finditer(url)}
+        content_type = next(
+            (ctype for marker, ctype in URL_CONTENT_TYPES.items() if marker in markers),
+            "post",
+        )
 
         # Extract domain for platform
-        try:
-            domain = urllib.parse.urlparse(url).netloc.replace("www.", "")
-        except:
-            domain = source
+        domain_match = URL_DOMAIN_RE.search(url)
+        domain = domain_match[1] if domain_match else source
 
-        return ContentCreate(
+        return dict(
             agent_id_external=f"web:{domain}",
             content_type=content_type,
             title=title,
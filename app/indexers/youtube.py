@@ -5,13 +5,15 @@ Uses RSS feeds for channels and search.
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import httpx
+from itertools import chain
 import feedparser
+import asyncio
 import logging
 import re
 
-from app.indexers.base import BaseIndexer
-from app.schemas.entity import ContentCreate
+from app.core.cache import TTLCache
+from app.indexers.base import BaseIndexer, RawItem
+from app.indexers.http import RESPONSE_TTL, cached_get
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +30,19 @@ AI_SEARCH_TERMS = [
     "AI music generation",
 ]
 
+# Tags derived from each search term, built once instead of per video
+QUERY_TAGS = {
+    query: ("video", "ai", *query.lower().split()[:3]) for query in AI_SEARCH_TERMS
+}
+
+# Video ID in watch, /v/ and youtu.be URLs
+VIDEO_ID_RE = re.compile(r"(?:v=|/v/|youtu\.be/)([^&?/]+)")
+
+# Videos parsed from each RSS feed URL, paired with the response they came
+# from. cached_get hands back the same response while a feed is fresh or
+# revalidates with 304, and then the feed is not parsed again.
+_parsed_feeds = TTLCache(maxsize=32, ttl=RESPONSE_TTL)
+
 
 class YouTubeIndexer(BaseIndexer):
     """Indexer for YouTube videos."""
@@ -44,85 +59,128 @@ class YouTubeIndexer(BaseIndexer):
         self, since: Optional[datetime] = None, limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Fetch AI-related videos from YouTube."""
-        items = []
-
         if not self.api_key:
             # Use RSS feeds as fallback
             return await self._fetch_via_rss(limit)
 
-        async with httpx.AsyncClient() as client:
-            for query in AI_SEARCH_TERMS[:5]:
-                try:
-                    params = {
-                        "part": "snippet",
-                        "q": query,
-                        "type": "video",
-                        "order": "date",
-                        "maxResults": min(limit // len(AI_SEARCH_TERMS[:5]), 20),
-                        "key": self.api_key,
-                    }
-
-                    response = await client.get(
-                        f"{self.base_url}/search", params=params
-                    )
-
-                    if response.status_code == 200:
-                        data = response.json()
-                        for item in data.get("items", []):
-                            item["_query"] = query
-                            items.append(item)
-                    elif response.status_code == 403:
-                        logger.warning("YouTube API quota exceeded")
-                        break
-
-                except Exception as e:
-                    logger.error(f"Error fetching from YouTube: {e}")
-
-        return items[:limit]
+        queries = AI_SEARCH_TERMS[:5]
+        max_results = min(limit // len(queries), 20)
+
+        # Searches run concurrently and push videos onto a queue as each
+        # response lands; once limit is reached the rest are cancelled
+        queue: asyncio.Queue = asyncio.Queue()
+        quota_exceeded = asyncio.Event()
+        producers = [
+            asyncio.create_task(self._search(query, max_results, queue, quota_exceeded))
+            for query in queries
+        ]
+
+        items = []
+        try:
+            pending = len(producers)
+            while pending and len(items) < limit:
+                item = await queue.get()
+                if item is None:
+                    pending -= 1
+                else:
+                    items.append(item)
+        finally:
+            for task in producers:
+                task.cancel()
+            await asyncio.gather(*producers, return_exceptions=True)
+
+        if quota_exceeded.is_set():
+            logger.warning("YouTube API quota exceeded")
+
+        return items
+
+    async def _search(
+        self,
+        query: str,
+        max_results: int,
+        queue: asyncio.Queue,
+        quota_exceeded: asyncio.Event,
+    ):
+        """Run one API search, queueing its videos and then a None marker."""
+        try:
+            params = {
+                "part": "snippet",
+                "q": query,
+                "type": "video",
+                "order": "date",
+                "maxResults": max_results,
+                "key": self.api_key,
+            }
+
+            response = await self.client.get(f"{self.base_url}/search", params=params)
+
+            if response.status_code == 200:
+                data = self._json(response)
+                for item in data.get("items", []):
+                    queue.put_nowait(RawItem(item, "youtube", query))
+            elif response.status_code == 403:
+                quota_exceeded.set()
+
+        except Exception as e:
+            logger.error(f"Error fetching from YouTube: {e}")
+        finally:
+            queue.put_nowait(None)
 
     async def _fetch_via_rss(self, limit: int) -> List[Dict[str, Any]]:
         """Fetch videos via RSS feeds as fallback."""
+        batches = await asyncio.gather(
+            *(self._fetch_rss(query, limit // 5) for query in AI_SEARCH_TERMS[:5])
+        )
+        return list(chain.from_iterable(batches))
+
+    async def _fetch_rss(self, query: str, limit: int) -> List[RawItem]:
+        """Fetch the RSS search feed for one query."""
         items = []
 
-        async with httpx.AsyncClient() as client:
-            for query in AI_SEARCH_TERMS[:5]:
-                try:
-                    # YouTube RSS search
-                    rss_url = f"https://www.youtube.com/rss/search/{query}/videos"
-                    response = await client.get(rss_url)
-
-                    if response.status_code == 200:
-                        feed = feedparser.parse(response.text)
-                        for entry in feed.entries[: limit // 5]:
-                            items.append(
-                                {
-                                    "id": {
-                                        "videoId": self._extract_video_id(entry.link)
-                                    },
-                                    "snippet": {
-                                        "title": entry.title,
-                                        "description": entry.get(
-                                            "description", entry.get("summary", "")
-                                        ),
-                                        "channelTitle": entry.get("author", "Unknown"),
-                                        "publishedAt": entry.get("published", ""),
-                                        "thumbnails": {},
-                                    },
-                                    "_query": query,
-                                }
-                            )
-                except Exception as e:
-                    logger.error(f"Error fetching YouTube RSS: {e}")
+        try:
+            # YouTube RSS search
+            rss_url = f"https://www.youtube.com/rss/search/{query}/videos"
+            response = await cached_get(rss_url)
+
+            if response.status_code == 200:
+                parsed = _parsed_feeds.get(rss_url)
+                if parsed is None or parsed[0] is not response:
+                    feed = feedparser.parse(response.content)
+                    parsed = (response, [self._rss_video(e) for e in feed.entries])
+                    _parsed_feeds.set(rss_url, parsed)
+
+                items = [
+                    RawItem(video, "youtube", query) for video in parsed[1][:limit]
+                ]
+        except Exception as e:
+            logger.error(f"Error fetching YouTube RSS: {e}")
 
         return items
 
+    def _rss_video(self, raw_entry) -> Dict[str, Any]:
+        """Shape a feed entry like an API search result."""
+        # Copy to a plain dict once; FeedParserDict resolves key aliases on
+        # every attribute and get() access
+        entry = dict(raw_entry)
+        return {
+            "id": {"videoId": self._extract_video_id(entry.get("link", ""))},
+            "snippet": {
+                "title": entry.get("title", "Untitled Video"),
+                "description": entry.get("description") or entry.get("summary") or "",
+                "channelTitle": entry.get("author", "Unknown"),
+                "publishedAt": entry.get("published", ""),
+                "thumbnails": {},
+            },
+        }
+
     def _extract_video_id(self, url: str) -> str:
         """Extract video ID from YouTube URL."""
-        match = re.search(r"(?:v=|/v/|youtu\.be/)([^&\?/]+)", url)
+        match = VIDEO_ID_RE.search(url)
         return match.group(1) if match else ""
 
-    def parse_content(self, raw_data: Dict[str, Any]) -> Optional[ContentCreate]:
+    def parse_content(self, item: RawItem) -> Optional[Dict[str, Any]]:
         """Parse YouTube video data."""
+        raw_data = item.raw
         if not raw_data:
             return None
 
@@ -139,12 +197,12 @@ class YouTubeIndexer(BaseIndexer):
         url = f"https://www.youtube.com/watch?v={video_id}"
 
         # Determine tags from query
-        query = raw_data.get("_query", "")
-        tags = ["video", "ai"]
-        if query:
-            tags.extend(query.lower().split()[:3])
+        query = item.extra or ""
+        tags = QUERY_TAGS.get(query)
+        if tags is None:
+            tags = ("video", "ai", *query.lower().split()[:3])
 
-        return ContentCreate(
+        return dict(
             agent_id_external=f"youtube:{channel}",
             content_type="video",
             title=title,
@@ -153,5 +211,5 @@ class YouTubeIndexer(BaseIndexer):
             thumbnail_url=snippet.get("thumbnails", {}).get("high", {}).get("url"),
             source_platform="youtube",
             source_url=url,
-            tags=tags[:10],
+            tags=list(tags),
         )
@@ -1,13 +1,17 @@
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.core.config import settings
 from app.db.database import init_db
 from app.api.entities import router as api_router
+from app.services.facets import rebuild_facets
 from app.services.scheduler import scheduler
+from app.indexers.http import close_client, get_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,9 +20,18 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    loop = type(asyncio.get_running_loop())
+    logger.info(f"Event loop: {loop.__module__}.{loop.__name__}")
+
     await init_db()
     logger.info("Database initialized")
 
+    # Bring the facet summary up to date with whatever is already stored
+    await rebuild_facets()
+
+    # Open the shared HTTP client up front rather than on the first fetch
+    get_client()
+
     # Start the indexing scheduler
     scheduler.start()
     logger.info("Indexing scheduler started")
@@ -27,10 +40,16 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     scheduler.stop()
+    await close_client()
     logger.info("Application shutdown complete")
 
 
-app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, lifespan=lifespan)
+app = FastAPI(
+    title=settings.APP_NAME,
+    version=settings.APP_VERSION,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 templates = Jinja2Templates(directory="app/templates")
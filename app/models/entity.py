@@ -8,13 +8,30 @@ from sqlalchemy import (
     Boolean,
     JSON,
     ForeignKey,
+    Index,
     Enum as SQLEnum,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 import enum
 
+# SQLite stores CURRENT_TIMESTAMP without microseconds; bind datetimes the
+# same way so range comparisons (e.g. search cursors) line up with stored rows
+Timestamp = DateTime().with_variant(
+    SQLITE_DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d "
+        "%(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
+# String lists: native arrays on PostgreSQL (GIN-indexable, @> containment),
+# JSON arrays elsewhere (matched through json_each)
+StringList = JSON().with_variant(ARRAY(String), "postgresql")
+
 
 class ContentType(enum.Enum):
     DOCUMENT = "document"
@@ -32,7 +49,7 @@ class ContentType(enum.Enum):
 class Agent(Base):
     __tablename__ = "agents"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     agent_id = Column(String(100), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=False, index=True)
     display_name = Column(String(255), nullable=True)
@@ -57,18 +74,18 @@ class Agent(Base):
 class AgentContent(Base):
     __tablename__ = "agent_contents"
 
-    id = Column(Integer, primary_key=True, index=True)
-    agent_id = Column(Integer, ForeignKey("agents.id"), nullable=False, index=True)
-    content_type = Column(String(50), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    agent_id = Column(Integer, ForeignKey("agents.id"), nullable=False)
+    content_type = Column(String(50), nullable=False)
     title = Column(String(500), nullable=False)
     description = Column(Text, nullable=True)
     content = Column(Text, nullable=True)
     content_url = Column(String(1000), nullable=True)
     thumbnail_url = Column(String(500), nullable=True)
-    source_platform = Column(String(100), nullable=True, index=True)
-    source_url = Column(String(1000), nullable=True)
-    tags = Column(JSON, nullable=True)
-    categories = Column(JSON, nullable=True)
+    source_platform = Column(String(100), nullable=True)
+    source_url = Column(String(1000), nullable=True, unique=True, index=True)
+    tags = Column(StringList, nullable=True)
+    categories = Column(StringList, nullable=True)
     language = Column(String(50), nullable=True)
     license = Column(String(100), nullable=True)
     quality_score = Column(Float, default=0.0)
@@ -79,8 +96,59 @@ class AgentContent(Base):
     is_public = Column(Boolean, default=True)
     is_featured = Column(Boolean, default=False)
     extra_data = Column(JSON, nullable=True)
-    indexed_at = Column(DateTime, server_default=func.now())
+    indexed_at = Column(Timestamp, server_default=func.now())
     created_at = Column(DateTime, nullable=True)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     agent = relationship("Agent", back_populates="contents")
+
+    # Back the /search (every sort_by), /recent and /featured orderings,
+    # alone and, for recency and quality, under a content_type filter.
+    # Content type, platform and agent lookups use composite indexes whose
+    # leading column still serves plain scans on that column, so none of
+    # them gets a single-column index of its own.
+    __table_args__ = (
+        Index("ix_agent_contents_recent", indexed_at.desc(), id.desc()),
+        Index("ix_agent_contents_quality", quality_score.desc(), id.desc()),
+        Index("ix_agent_contents_views", view_count.desc(), id.desc()),
+        Index("ix_agent_contents_likes", like_count.desc(), id.desc()),
+        Index(
+            "ix_agent_contents_type_recent",
+            content_type,
+            indexed_at.desc(),
+            id.desc(),
+        ),
+        Index(
+            "ix_agent_contents_type_quality",
+            content_type,
+            quality_score.desc(),
+            id.desc(),
+        ),
+        Index("ix_agent_contents_featured", is_featured, quality_score.desc()),
+        Index("ix_agent_contents_platform_recent", source_platform, indexed_at),
+        Index("ix_agent_contents_agent_recent", agent_id, indexed_at),
+        Index("ix_agent_contents_tags", tags, postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+        # Trigram indexes let PostgreSQL serve the search ILIKE '%term%'
+        # filters without a sequential scan (needs the pg_trgm extension)
+        *(
+            Index(
+                f"ix_agent_contents_{name}_trgm",
+                name,
+                postgresql_using="gin",
+                postgresql_ops={name: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql")
+            for name in ("title", "description", "content")
+        ),
+    )
+
+
+class ContentFacet(Base):
+    """Filter values and table totals with their counts, rebuilt after writes."""
+
+    __tablename__ = "content_facets"
+
+    kind = Column(String(20), primary_key=True)
+    value = Column(String(500), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -4,7 +4,7 @@ Each platform has an indexer that fetches AI-generated content.
 """
 
 from enum import Enum
-from typing import Dict, Type, Optional
+from typing import Dict, Type, Optional, Tuple
 from dataclasses import dataclass
 
 
@@ -19,7 +19,7 @@ class PlatformType(str, Enum):
     MODEL = "model"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Platform:
     id: str
     name: str
@@ -204,6 +204,11 @@ PLATFORMS: Dict[str, Platform] = {
     ),
 }
 
+# Platforms grouped by type once, in registry order
+_PLATFORMS_BY_TYPE: Dict[PlatformType, Tuple[Platform, ...]] = {
+    t: tuple(p for p in PLATFORMS.values() if p.type == t) for t in PlatformType
+}
+
 
 def get_platform(platform_id: str) -> Optional[Platform]:
     return PLATFORMS.get(platform_id)
@@ -213,5 +218,5 @@ def get_all_platforms() -> Dict[str, Platform]:
     return PLATFORMS
 
 
-def get_platforms_by_type(platform_type: PlatformType) -> list[Platform]:
-    return [p for p in PLATFORMS.values() if p.type == platform_type]
+def get_platforms_by_type(platform_type: PlatformType) -> Tuple[Platform, ...]:
+    return _PLATFORMS_BY_TYPE.get(platform_type, ())
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List, Any
 from datetime import datetime
+from functools import cached_property
 
 
 class AgentBase(BaseModel):
@@ -28,8 +29,7 @@ class AgentResponse(AgentBase):
     total_creations: int
     created_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ContentBase(BaseModel):
@@ -50,6 +50,13 @@ class ContentBase(BaseModel):
 class ContentCreate(ContentBase):
     agent_id_external: str
 
+    @field_validator("source_url")
+    @classmethod
+    def blank_url_to_none(cls, value: Optional[str]) -> Optional[str]:
+        # source_url is unique, and NULLs never collide there; an empty
+        # string would let only one link-less item ever be stored
+        return value or None
+
 
 class ContentResponse(ContentBase):
     id: int
@@ -65,16 +72,17 @@ class ContentResponse(ContentBase):
     created_at: Optional[datetime] = None
     agent: Optional[AgentResponse] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SearchResult(BaseModel):
     results: List[ContentResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    has_more: bool = False
+    next_cursor: Optional[str] = None
     query: str
 
 
@@ -88,6 +96,16 @@ class SearchQuery(BaseModel):
     page: int = Field(1, ge=1)
     page_size: int = Field(20, ge=1, le=100)
 
+    @cached_property
+    def search_pattern(self) -> str:
+        """ILIKE pattern matching the query anywhere in a field."""
+        return f"%{self.query}%"
+
+    @cached_property
+    def query_tag(self) -> str:
+        """The query lowercased, for matching it against tags."""
+        return self.query.lower()
+
 
 class StatsResponse(BaseModel):
     total_agents: int
@@ -0,0 +1,112 @@
+"""
+Facet summary - the distinct filter values and their counts, plus table
+totals, kept in the content_facets table. Facet endpoints and stats read this
+small table instead of scanning all content; it is rebuilt shortly after
+writes, coalescing bursts into one refresh.
+"""
+
+from typing import Callable, List, Optional
+import asyncio
+import logging
+
+from sqlalchemy import delete, func, insert, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import async_session_maker
+from app.models.entity import Agent, AgentContent, ContentFacet
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait after a write before rebuilding, so a burst of writes
+# (e.g. an indexer sweep) triggers a single refresh
+FACET_REFRESH_DELAY = 2.0
+
+# Called after each refresh commits, e.g. to drop cached API responses built
+# from the old rows. Registered by the layers above, so this module doesn't
+# depend on them.
+_refresh_listeners: List[Callable[[], None]] = []
+
+_refresh_pending = False
+_refresh_task: Optional[asyncio.Task] = None
+
+
+def on_facets_refreshed(listener: Callable[[], None]) -> Callable[[], None]:
+    """Register a callback run after every facet refresh; usable as a decorator."""
+    _refresh_listeners.append(listener)
+    return listener
+
+
+async def _grouped_counts(db: AsyncSession, column) -> List[tuple]:
+    # Every grouped column leads an index (content_type, source_platform,
+    # agent_type), so the count walks that index in order, not the table
+    result = await db.execute(
+        select(column, func.count()).where(column.isnot(None)).group_by(column)
+    )
+    return [(value, count) for value, count in result.all() if value]
+
+
+async def _tag_counts(db: AsyncSession) -> List[tuple]:
+    # Unnest and count inside the database so only distinct tags come back
+    if db.bind.dialect.name == "postgresql":
+        values = func.unnest(AgentContent.tags).table_valued("value").render_derived()
+    else:
+        values = func.json_each(AgentContent.tags).table_valued("value")
+    result = await db.execute(
+        select(values.c.value, func.count(func.distinct(AgentContent.id)))
+        .join_from(AgentContent, values, true())
+        .where(AgentContent.tags.isnot(None))
+        .group_by(values.c.value)
+    )
+    return [(value, count) for value, count in result.all() if value]
+
+
+async def refresh_facets(db: AsyncSession):
+    """Recompute every facet and replace the table contents in one transaction."""
+    facets = {
+        "content_type": await _grouped_counts(db, AgentContent.content_type),
+        "platform": await _grouped_counts(db, AgentContent.source_platform),
+        "tag": await _tag_counts(db),
+        "agent_type": await _grouped_counts(db, Agent.agent_type),
+        # Table sizes for get_stats, so it never counts the tables itself
+        "total": [("agents", await db.scalar(select(func.count(Agent.id))))],
+    }
+    rows = [
+        {"kind": kind, "value": value, "count": count}
+        for kind, values in facets.items()
+        for value, count in values
+    ]
+
+    await db.execute(delete(ContentFacet))
+    if rows:
+        await db.execute(insert(ContentFacet), rows)
+    await db.commit()
+
+    for listener in _refresh_listeners:
+        listener()
+
+
+async def rebuild_facets():
+    """Refresh the facet table on its own session."""
+    async with async_session_maker() as db:
+        await refresh_facets(db)
+
+
+async def _refresh_later():
+    global _refresh_pending
+    while _refresh_pending:
+        await asyncio.sleep(FACET_REFRESH_DELAY)
+        # Writes landing during the rebuild set the flag again
+        _refresh_pending = False
+        try:
+            await rebuild_facets()
+        except Exception as e:
+            logger.error(f"Facet refresh failed: {e}")
+
+
+def schedule_facet_refresh() -> asyncio.Task:
+    """Rebuild the facet table in the background, debounced."""
+    global _refresh_pending, _refresh_task
+    _refresh_pending = True
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh_later())
+    return _refresh_task
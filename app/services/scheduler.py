@@ -2,18 +2,19 @@
 Indexing scheduler - runs indexers on schedule.
 """
 
-from datetime import datetime
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, Optional
 import asyncio
 import logging
-import os
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.database import async_session_maker
+from app.indexers.base import BaseIndexer
 from app.indexers.github import GitHubIndexer
 from app.indexers.huggingface import HuggingFaceIndexer
 from app.indexers.civitai import CivitaiIndexer
@@ -26,6 +27,46 @@ from app.indexers.websearch import WebSearchIndexer
 
 logger = logging.getLogger(__name__)
 
+# Key the full sweep is tracked under in the run and status maps
+SWEEP = "all"
+
+# Indexer constructors by platform, built once with credentials from settings
+INDEXER_FACTORIES: Dict[str, Callable[[AsyncSession], BaseIndexer]] = {
+    "github": lambda db: GitHubIndexer(db, api_token=settings.GITHUB_TOKEN),
+    "huggingface": lambda db: HuggingFaceIndexer(db, api_token=settings.HF_TOKEN),
+    "civitai": lambda db: CivitaiIndexer(db, api_token=settings.CIVITAI_TOKEN),
+    "youtube": lambda db: YouTubeIndexer(db, api_key=settings.YOUTUBE_API_KEY),
+    "reddit": lambda db: RedditIndexer(
+        db,
+        client_id=settings.REDDIT_CLIENT_ID,
+        client_secret=settings.REDDIT_CLIENT_SECRET,
+    ),
+    "arxiv": ArxivIndexer,
+    "dynamic": DynamicWebIndexer,
+    "moltbook": MoltbookIndexer,
+    "websearch": WebSearchIndexer,
+}
+
+# Scheduled indexer runs: (job id, trigger, (platform, limit))
+JOBS = (
+    # Dynamic web search - every 2 hours
+    ("websearch_indexer", IntervalTrigger(hours=2), ("websearch", 30)),
+    # Dynamic indexer (HackerNews, Dev.to, Medium) - every 3 hours
+    ("dynamic_indexer", IntervalTrigger(hours=3), ("dynamic", 50)),
+    # Moltbook - every 4 hours
+    ("moltbook_indexer", IntervalTrigger(hours=4), ("moltbook", 30)),
+    # GitHub - every 6 hours
+    ("github_indexer", IntervalTrigger(hours=6), ("github", 50)),
+    # HuggingFace - every 6 hours
+    ("huggingface_indexer", IntervalTrigger(hours=6), ("huggingface", 50)),
+    # Civitai - every 12 hours
+    ("civitai_indexer", IntervalTrigger(hours=12), ("civitai", 50)),
+    # Reddit - every 4 hours
+    ("reddit_indexer", IntervalTrigger(hours=4), ("reddit", 30)),
+    # arXiv - daily at 2 AM
+    ("arxiv_indexer", CronTrigger(hour=2, minute=0), ("arxiv", 100)),
+)
+
 
 class IndexingScheduler:
     """Manages scheduled indexing jobs."""
@@ -34,36 +75,44 @@ class IndexingScheduler:
         self.scheduler = AsyncIOScheduler()
         self.indexers = {}
         self.last_run: Dict[str, datetime] = {}
+        self.last_result: Dict[str, Dict[str, Any]] = {}
         self.running = False
-
-    def get_indexer(self, platform: str, db: AsyncSession):
+        # In-flight indexer runs, shared by concurrent callers per platform
+        self._running: Dict[str, asyncio.Task] = {}
+        # Sweep slots: a counter under a condition rather than a Semaphore,
+        # so the limit can be changed while a sweep is running
+        self._slots = asyncio.Condition()
+        self._active = 0
+        self.max_concurrency = settings.INDEXER_CONCURRENCY
+
+    def get_indexer(self, platform: str, db: AsyncSession) -> Optional[BaseIndexer]:
         """Get indexer instance for a platform."""
-        indexers = {
-            "github": lambda: GitHubIndexer(
-                db, api_token=os.environ.get("GITHUB_TOKEN")
-            ),
-            "huggingface": lambda: HuggingFaceIndexer(
-                db, api_token=os.environ.get("HF_TOKEN")
-            ),
-            "civitai": lambda: CivitaiIndexer(
-                db, api_token=os.environ.get("CIVITAI_TOKEN")
-            ),
-            "youtube": lambda: YouTubeIndexer(
-                db, api_key=os.environ.get("YOUTUBE_API_KEY")
-            ),
-            "reddit": lambda: RedditIndexer(
-                db,
-                client_id=os.environ.get("REDDIT_CLIENT_ID"),
-                client_secret=os.environ.get("REDDIT_CLIENT_SECRET"),
-            ),
-            "arxiv": lambda: ArxivIndexer(db),
-            "dynamic": lambda: DynamicWebIndexer(db),
-            "moltbook": lambda: MoltbookIndexer(db),
-            "websearch": lambda: WebSearchIndexer(db),
-        }
-        return indexers.get(platform, lambda: None)()
+        factory = INDEXER_FACTORIES.get(platform)
+        return factory(db) if factory else None
+
+    def start_indexer(self, platform: str, limit: int = 100) -> asyncio.Task:
+        """Start an indexer run, or return the one already in flight."""
+        return self._start(platform, lambda: self._run_indexer(platform, limit))
+
+    def start_all_indexers(self, limit: int = 50) -> asyncio.Task:
+        """Start a full sweep, or return the one already in flight."""
+        return self._start(SWEEP, lambda: self._run_sweep(limit))
+
+    def _start(self, key: str, run: Callable[[], Any]) -> asyncio.Task:
+        # Synchronous, so the lookup and insert can't interleave with other
+        # coroutines on the loop
+        task = self._running.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(run())
+            self._running[key] = task
+        return task
 
     async def run_indexer(self, platform: str, limit: int = 100) -> Dict[str, Any]:
+        """Run a single indexer, joining the in-flight run if there is one."""
+        # Shield so a cancelled caller doesn't cancel the shared run
+        return await asyncio.shield(self.start_indexer(platform, limit))
+
+    async def _run_indexer(self, platform: str, limit: int) -> Dict[str, Any]:
         """Run a single indexer."""
         logger.info(f"Running indexer for {platform}")
 
@@ -74,12 +123,55 @@ class IndexingScheduler:
 
             try:
                 since = self.last_run.get(platform)
+                # Stamp the start, so items published mid-run are not missed
+                started_at = datetime.now(timezone.utc)
                 stats = await indexer.run(since=since, limit=limit)
-                self.last_run[platform] = datetime.utcnow()
-                return stats
+                self.last_run[platform] = started_at
             except Exception as e:
                 logger.error(f"Indexer {platform} failed: {e}")
-                return {"error": str(e)}
+                stats = {"error": str(e)}
+
+        self.last_result[platform] = stats
+        return stats
+
+    async def _run_sweep(self, limit: int) -> Dict[str, Any]:
+        """Run all indexers and record the sweep like a single platform run."""
+        started_at = datetime.now(timezone.utc)
+        results = await self.run_all_indexers(limit=limit)
+        self.last_run[SWEEP] = started_at
+        self.last_result[SWEEP] = results
+        return results
+
+    async def _acquire_slot(self):
+        """Wait for a free sweep slot and take it."""
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._active < self.max_concurrency)
+            self._active += 1
+
+    async def _release_slot(self):
+        """Give a sweep slot back and wake one waiter."""
+        async with self._slots:
+            self._active -= 1
+            self._slots.notify(1)
+
+    async def set_concurrency(self, limit: int):
+        """Change how many indexers a sweep runs at once."""
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+        async with self._slots:
+            self.max_concurrency = limit
+            self._slots.notify_all()
+
+    def get_status(self, platform: str) -> Dict[str, Any]:
+        """Get the current indexing state for a platform, or SWEEP."""
+        task = self._running.get(platform)
+        last_run = self.last_run.get(platform)
+        return {
+            "platform": platform,
+            "status": "running" if task and not task.done() else "idle",
+            "last_run": last_run.isoformat() if last_run else None,
+            "last_result": self.last_result.get(platform),
+        }
 
     async def run_all_indexers(self, limit: int = 50) -> Dict[str, Any]:
         """Run all indexers."""
@@ -92,90 +184,34 @@ class IndexingScheduler:
             "reddit",
             "arxiv",
         ]
-        results = {}
 
-        for platform in platforms:
+        # Indexers hit different hosts, so run a few at a time
+        async def run_bounded(platform: str) -> Dict[str, Any]:
+            await self._acquire_slot()
             try:
-                results[platform] = await self.run_indexer(platform, limit=limit)
-                await asyncio.sleep(2)
-            except Exception as e:
-                results[platform] = {"error": str(e)}
+                return await self.run_indexer(platform, limit=limit)
+            finally:
+                await self._release_slot()
 
-        return results
-
-    def schedule_jobs(self):
-        """Set up scheduled indexing jobs."""
-        # Dynamic web search - every 2 hours
-        self.scheduler.add_job(
-            self.run_indexer,
-            IntervalTrigger(hours=2),
-            id="websearch_indexer",
-            args=["websearch", 30],
-            replace_existing=True,
+        outcomes = await asyncio.gather(
+            *(run_bounded(platform) for platform in platforms),
+            return_exceptions=True,
         )
 
-        # Dynamic indexer (HackerNews, Dev.to, Medium) - every 3 hours
-        self.scheduler.add_job(
-            self.run_indexer,
-            IntervalTrigger(hours=3),
-            id="dynamic_indexer",
-            args=["dynamic", 50],
-            replace_existing=True,
-        )
-
-        # Moltbook - every 4 hours
-        self.scheduler.add_job(
-            self.run_indexer,
-            IntervalTrigger(hours=4),
-            id="moltbook_indexer",
-            args=["moltbook", 30],
-            replace_existing=True,
-        )
-
-        # GitHub - every 6 hours
-        self.scheduler.add_job(
-            self.run_indexer,
-            IntervalTrigger(hours=6),
-            id="github_indexer",
-            args=["github", 50],
-            replace_existing=True,
-        )
-
-        # HuggingFace - every 6 hours
-        self.scheduler.add_job(
-            self.run_indexer,
-            IntervalTrigger(hours=6),
-            id="huggingface_indexer",
-            args=["huggingface", 50],
-            replace_existing=True,
-        )
-
-        # Civitai - every 12 hours
-        self.scheduler.add_job(
-            self.run_indexer,
-            IntervalTrigger(hours=12),
-            id="civitai_indexer",
-            args=["civitai", 50],
-            replace_existing=True,
-        )
-
-        # Reddit - every 4 hours
-        self.scheduler.add_job(
-            self.run_indexer,
-            IntervalTrigger(hours=4),
-            id="reddit_indexer",
-            args=["reddit", 30],
-            replace_existing=True,
-        )
+        return {
+            platform: {"error": str(outcome)}
+            if isinstance(outcome, Exception)
+            else outcome
+            for platform, outcome in zip(platforms, outcomes)
+        }
 
-        # arXiv - daily at 2 AM
-        self.scheduler.add_job(
-            self.run_indexer,
-            CronTrigger(hour=2, minute=0),
-            id="arxiv_indexer",
-            args=["arxiv", 100],
-            replace_existing=True,
-        )
+    def schedule_jobs(self):
+        """Set up scheduled indexing jobs that aren't registered yet."""
+        for job_id, trigger, args in JOBS:
+            if self.scheduler.get_job(job_id) is None:
+                self.scheduler.add_job(
+                    self.run_indexer, trigger, id=job_id, args=list(args)
+                )
 
         logger.info("Scheduled indexing jobs configured")
 
@@ -1,26 +1,172 @@
-from sqlalchemy import select, or_, and_, func, desc
+from sqlalchemy import (
+    String,
+    select,
+    or_,
+    and_,
+    func,
+    desc,
+    insert,
+    bindparam,
+    tuple_,
+    type_coerce,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from typing import List, Optional, Tuple
-from app.models.entity import Agent, AgentContent
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime
+from collections import Counter, OrderedDict
+from itertools import islice
+from app.db.database import conflict_insert
+from app.models.entity import Agent, AgentContent, ContentFacet, Timestamp
 from app.schemas.entity import SearchQuery, ContentCreate, AgentCreate
+from app.services.facets import schedule_facet_refresh
+
+# Small reads join the agent into the same query; paged searches load it
+# with a second SELECT so LIMIT/OFFSET apply to content rows. Any other lazy
+# load raises instead of silently issuing a query per row.
+_JOINED_AGENT = (joinedload(AgentContent.agent), raiseload("*"))
+_SELECTED_AGENT = (selectinload(AgentContent.agent), raiseload("*"))
+
+# Single-row lookup built once and reused with bound parameters
+_CONTENT_BY_ID = (
+    select(AgentContent)
+    .options(*_JOINED_AGENT)
+    .where(AgentContent.id == bindparam("content_id"))
+)
+
+# Rows per multi-row INSERT, well under the bound-parameter limits of
+# SQLite and PostgreSQL
+BULK_INSERT_CHUNK = 500
+
+# Search pages skip ORM hydration: content and agent columns come back in one
+# joined row and are split into the nested response shape as plain dicts
+_CONTENT_KEYS = tuple(column.name for column in AgentContent.__table__.columns)
+_AGENT_KEYS = tuple(column.name for column in Agent.__table__.columns)
+_ROW_COLUMNS = (
+    *AgentContent.__table__.columns,
+    *(column.label(f"agent_{column.name}") for column in Agent.__table__.columns),
+)
+
+# Rows fetched and hydrated per batch when streaming search results
+STREAM_BATCH_SIZE = 50
+
+# Facet kinds in the summary table, by their key in get_facets
+FACET_KEYS = {
+    "content_type": "content_types",
+    "platform": "platforms",
+    "tag": "tags",
+    "agent_type": "agent_types",
+}
+
+# Content types reported by get_stats, zero-filled when absent
+STATS_CONTENT_TYPES = (
+    "document",
+    "video",
+    "post",
+    "code",
+    "artwork",
+    "music",
+    "research",
+    "conversation",
+    "dataset",
+    "simulation",
+)
+
+
+# Agent primary keys by external id, recorded once committed. The cache is
+# per process and can't see agents deleted elsewhere (a seed clear, say), so
+# bulk writes confirm cached keys with one read before skipping the agent
+# upsert; concurrent misses just run the idempotent upsert twice.
+AGENT_PK_CACHE_MAX = 10000
+
+_agent_pks: "OrderedDict[str, int]" = OrderedDict()
+
+
+def _cached_agent_pk(agent_id: str) -> Optional[int]:
+    pk = _agent_pks.get(agent_id)
+    if pk is not None:
+        _agent_pks.move_to_end(agent_id)
+    return pk
+
+
+def _remember_agent_pks(pks: Dict[str, int]):
+    """Record committed agent keys, evicting the least recently used."""
+    for agent_id, pk in pks.items():
+        _agent_pks[agent_id] = pk
+        _agent_pks.move_to_end(agent_id)
+    while len(_agent_pks) > AGENT_PK_CACHE_MAX:
+        _agent_pks.popitem(last=False)
+
+
+def _content_dicts(rows) -> List[Dict[str, Any]]:
+    """Split joined search rows into content dicts with a nested agent."""
+    split = len(_CONTENT_KEYS)
+    end = split + len(_AGENT_KEYS)
+    contents = []
+    for row in rows:
+        content = dict(zip(_CONTENT_KEYS, row[:split]))
+        content["agent"] = dict(zip(_AGENT_KEYS, row[split:end]))
+        contents.append(content)
+    return contents
+
+
+def _content_row(content: ContentCreate, agent_pk: int) -> dict:
+    """
+    AgentContent column values for a validated ContentCreate.
+
+    Every ContentCreate field holds a plain value, so a copy of the instance
+    dict is what model_dump would build, without walking the fields again.
+    """
+    row = dict(content.__dict__)
+    del row["agent_id_external"]
+    row["agent_id"] = agent_pk
+    return row
 
 
 class SearchService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def search_content(
-        self, query: SearchQuery
-    ) -> Tuple[List[AgentContent], int]:
-        search_term = f"%{query.query}%"
+    def _has_tag(self, tag: str):
+        """Condition matching content whose tags include tag."""
+        if self.db.bind.dialect.name == "postgresql":
+            # Array containment, served by the GIN index on tags
+            return type_coerce(AgentContent.tags, ARRAY(String)).contains([tag])
+
+        # JSON arrays: compare against each element, not the serialized text
+        values = func.json_each(AgentContent.tags).table_valued("value")
+        return select(values.c.value).where(values.c.value == tag).exists()
+
+    def _has_tags(self, tags: List[str]):
+        """Condition matching content whose tags include every one of tags."""
+        tags = list(dict.fromkeys(tags))
+        if len(tags) == 1:
+            return self._has_tag(tags[0])
+
+        if self.db.bind.dialect.name == "postgresql":
+            # One containment test for the whole list, one GIN index probe
+            return type_coerce(AgentContent.tags, ARRAY(String)).contains(tags)
+
+        values = func.json_each(AgentContent.tags).table_valued("value")
+        matched = (
+            select(func.count(func.distinct(values.c.value)))
+            .where(values.c.value.in_(tags))
+            .scalar_subquery()
+        )
+        return matched == len(tags)
+
+    def _search_where(self, stmt, query: SearchQuery, agent_joined: bool = False):
+        """Apply the search filters, joining Agent only to filter on it."""
+        search_term = query.search_pattern
 
         conditions = [
             or_(
                 AgentContent.title.ilike(search_term),
                 AgentContent.description.ilike(search_term),
                 AgentContent.content.ilike(search_term),
-                AgentContent.tags.contains([query.query.lower()]),
+                self._has_tag(query.query_tag),
             )
         ]
 
@@ -33,12 +179,25 @@ class SearchService:
             )
 
         if query.tags:
-            for tag in query.tags:
-                conditions.append(AgentContent.tags.contains([tag]))
+            conditions.append(self._has_tags(query.tags))
 
         if query.agent_type:
+            # agent_id is NOT NULL, so the join never drops content rows
+            if not agent_joined:
+                stmt = stmt.join(Agent)
             conditions.append(Agent.agent_type == query.agent_type)
 
+        return stmt.where(and_(*conditions))
+
+    def _search_rows_stmt(self, query: SearchQuery):
+        """Search over plain columns, with the agent joined into each row."""
+        stmt = select(*_ROW_COLUMNS).join_from(AgentContent, Agent)
+        return self._search_where(stmt, query, agent_joined=True)
+
+    def _search_stmt(self, query: SearchQuery):
+        return self._search_where(select(AgentContent).options(*_SELECTED_AGENT), query)
+
+    def _page(self, stmt, query: SearchQuery):
         sort_column = AgentContent.quality_score
         if query.sort_by == "recent":
             sort_column = AgentContent.indexed_at
@@ -47,112 +206,250 @@ class SearchService:
         elif query.sort_by == "liked":
             sort_column = AgentContent.like_count
 
-        stmt = (
-            select(AgentContent)
-            .join(Agent)
-            .options(selectinload(AgentContent.agent))
-            .where(and_(*conditions))
-            .order_by(desc(sort_column))
+        return stmt.order_by(desc(sort_column), desc(AgentContent.id)).offset(
+            (query.page - 1) * query.page_size
         )
 
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = await self.db.scalar(count_stmt) or 0
-
-        stmt = stmt.offset((query.page - 1) * query.page_size).limit(query.page_size)
-        result = await self.db.execute(stmt)
+    async def _count(self, query: SearchQuery) -> int:
+        # A bare COUNT over the filters, not a subquery of the entity SELECT
+        count_stmt = self._search_where(
+            select(func.count()).select_from(AgentContent), query
+        )
+        return await self.db.scalar(count_stmt) or 0
 
-        return result.scalars().all(), total
+    async def search_content(
+        self, query: SearchQuery, include_total: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], bool]:
+        """Offset-paginated search, counting the total if include_total is set."""
+        stmt = self._search_rows_stmt(query)
+        if not include_total:
+            # Fetch one extra row to learn whether another page exists
+            stmt = self._page(stmt, query).limit(query.page_size + 1)
+            rows = (await self.db.execute(stmt)).all()
+            return (
+                _content_dicts(rows[: query.page_size]),
+                None,
+                len(rows) > query.page_size,
+            )
 
-    async def get_content_by_id(self, content_id: int) -> Optional[AgentContent]:
+        # The window count sees every matching row before LIMIT/OFFSET, so
+        # the page and the total come back from a single scan
+        paged = self._page(
+            stmt.add_columns(func.count().over().label("total")), query
+        ).limit(query.page_size + 1)
+        rows = (await self.db.execute(paged)).all()
+
+        if rows:
+            total = rows[0].total
+        elif query.page > 1:
+            # Past the last page there is no row to carry the total
+            total = await self._count(query)
+        else:
+            total = 0
+
+        contents = _content_dicts(rows[: query.page_size])
+        return contents, total, len(rows) > query.page_size
+
+    async def search_content_stream(
+        self, query: SearchQuery
+    ) -> AsyncIterator[AgentContent]:
+        """Yield one page of search results from a server-side cursor."""
         stmt = (
-            select(AgentContent)
-            .options(selectinload(AgentContent.agent))
-            .where(AgentContent.id == content_id)
+            self._page(self._search_stmt(query), query)
+            .limit(query.page_size)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
         )
-        result = await self.db.execute(stmt)
+        result = await self.db.stream(stmt)
+        # Rows are hydrated, and their agents loaded, one batch at a time
+        async for partition in result.scalars().partitions():
+            for content in partition:
+                yield content
+
+    async def search_content_keyset(
+        self,
+        query: SearchQuery,
+        after: Optional[Tuple[datetime, int]] = None,
+        include_total: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], bool]:
+        """Newest-first search continuing after an (indexed_at, id) cursor."""
+        stmt = self._search_rows_stmt(query)
+        total = await self._count(query) if include_total else None
+
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(AgentContent.indexed_at, AgentContent.id)
+                < tuple_(bindparam("after_ts", after[0], type_=Timestamp), after[1])
+            )
+
+        stmt = stmt.order_by(
+            desc(AgentContent.indexed_at), desc(AgentContent.id)
+        ).limit(query.page_size + 1)
+        rows = (await self.db.execute(stmt)).all()
+
+        return (
+            _content_dicts(rows[: query.page_size]),
+            total,
+            len(rows) > query.page_size,
+        )
+
+    async def get_content_by_id(self, content_id: int) -> Optional[AgentContent]:
+        result = await self.db.execute(_CONTENT_BY_ID, {"content_id": content_id})
         return result.scalar_one_or_none()
 
     async def create_agent(self, agent: AgentCreate) -> Agent:
-        db_agent = Agent(**agent.model_dump())
-        self.db.add(db_agent)
+        # RETURNING hands back the stored row, server defaults included, so
+        # no refresh SELECT is needed after the commit
+        db_agent = await self.db.scalar(
+            insert(Agent).values(**agent.model_dump()).returning(Agent)
+        )
         await self.db.commit()
-        await self.db.refresh(db_agent)
-        return db_agent
+        _remember_agent_pks({db_agent.agent_id: db_agent.id})
 
-    async def get_or_create_agent(self, agent_id: str, name: str, **kwargs) -> Agent:
-        stmt = select(Agent).where(Agent.agent_id == agent_id)
-        result = await self.db.execute(stmt)
-        agent = result.scalar_one_or_none()
-
-        if agent:
-            return agent
+        schedule_facet_refresh()
+        return db_agent
 
-        agent_data = {"agent_id": agent_id, "name": name, **kwargs}
-        return await self.create_agent(AgentCreate(**agent_data))
+    async def create_content(self, content: ContentCreate) -> Optional[AgentContent]:
+        """Store one content item, or return None if its source_url is taken."""
+        # Create the agent or bump its creation count in one statement, so
+        # concurrent creates for the same agent neither race nor lose counts
+        agent_stmt = (
+            conflict_insert(Agent)
+            .values(
+                agent_id=content.agent_id_external,
+                name=content.agent_id_external,
+                total_creations=1,
+            )
+            .on_conflict_do_update(
+                index_elements=["agent_id"],
+                set_={"total_creations": func.coalesce(Agent.total_creations, 0) + 1},
+            )
+            .returning(Agent.id)
+        )
+        agent_pk = await self.db.scalar(agent_stmt)
+
+        db_content = await self.db.scalar(
+            conflict_insert(AgentContent)
+            .values(**_content_row(content, agent_pk))
+            .on_conflict_do_nothing(index_elements=["source_url"])
+            .returning(AgentContent)
+            .options(*_SELECTED_AGENT)
+        )
+        if db_content is None:
+            # Undo the agent's creation count for the rejected row
+            await self.db.rollback()
+            return None
+        await self.db.commit()
+        _remember_agent_pks({content.agent_id_external: agent_pk})
 
-    async def create_content(self, content: ContentCreate) -> AgentContent:
-        stmt = select(Agent).where(Agent.agent_id == content.agent_id_external)
-        result = await self.db.execute(stmt)
-        agent = result.scalar_one_or_none()
+        schedule_facet_refresh()
+        return db_content
 
-        if not agent:
-            agent = await self.create_agent(
-                AgentCreate(
-                    agent_id=content.agent_id_external, name=content.agent_id_external
+    async def create_contents_bulk(self, contents: List[ContentCreate]) -> int:
+        """
+        Insert many content items in one transaction.
+
+        Agents are upserted with one statement for the whole batch and content
+        rows are written with multi-row INSERTs. Duplicates are rejected by the
+        unique indexes on agent_id and source_url instead of a lookup per item.
+
+        Returns:
+            Number of content rows inserted
+        """
+        if not contents:
+            return 0
+
+        ext_ids = {c.agent_id_external for c in contents}
+        agent_pks = {}
+        for ext_id in ext_ids:
+            pk = _cached_agent_pk(ext_id)
+            if pk is not None:
+                agent_pks[ext_id] = pk
+
+        # Keep only cached keys whose row still exists under the same
+        # external id; a read, where the upsert would rewrite every agent row.
+        # Matching both columns also catches a key reused after a delete.
+        agents_table = Agent.__table__
+        if agent_pks:
+            result = await self.db.execute(
+                select(agents_table.c.agent_id, agents_table.c.id).where(
+                    agents_table.c.id.in_(agent_pks.values())
                 )
             )
-
-        content_data = content.model_dump(exclude={"agent_id_external"})
-        content_data["agent_id"] = agent.id
-
-        db_content = AgentContent(**content_data)
-        self.db.add(db_content)
-
-        agent.total_creations = (agent.total_creations or 0) + 1
+            live = set(result.all())
+            for ext_id, pk in list(agent_pks.items()):
+                if (ext_id, pk) not in live:
+                    del agent_pks[ext_id]
+                    _agent_pks.pop(ext_id, None)
+
+        # Create missing agents and fetch their keys in one statement; the
+        # no-op DO UPDATE makes RETURNING include rows that already exist
+        unknown = [ext_id for ext_id in ext_ids if ext_id not in agent_pks]
+        if unknown:
+            agent_stmt = conflict_insert(agents_table).values(
+                [{"agent_id": ext_id, "name": ext_id} for ext_id in unknown]
+            )
+            agent_stmt = agent_stmt.on_conflict_do_update(
+                index_elements=["agent_id"],
+                set_={"agent_id": agent_stmt.excluded.agent_id},
+            ).returning(agents_table.c.agent_id, agents_table.c.id)
+            agent_pks.update((await self.db.execute(agent_stmt)).all())
+
+        rows = [
+            _content_row(content, agent_pks[content.agent_id_external])
+            for content in contents
+        ]
+        table = AgentContent.__table__
+        inserted = Counter()
+        for start in range(0, len(rows), BULK_INSERT_CHUNK):
+            stmt = (
+                conflict_insert(table)
+                .values(rows[start : start + BULK_INSERT_CHUNK])
+                .on_conflict_do_nothing(index_elements=["source_url"])
+                .returning(table.c.agent_id)
+            )
+            inserted.update((await self.db.execute(stmt)).scalars())
+
+        # Update each agent's creation count in one executemany
+        if inserted:
+            await self.db.execute(
+                update(agents_table)
+                .where(agents_table.c.id == bindparam("agent_pk"))
+                .values(
+                    total_creations=func.coalesce(agents_table.c.total_creations, 0)
+                    + bindparam("inc")
+                ),
+                [{"agent_pk": pk, "inc": n} for pk, n in inserted.items()],
+            )
 
         await self.db.commit()
-        await self.db.refresh(db_content)
+        _remember_agent_pks(agent_pks)
+        if inserted:
+            schedule_facet_refresh()
 
-        return db_content
+        return sum(inserted.values())
 
     async def get_stats(self) -> dict:
-        total_agents = await self.db.scalar(select(func.count(Agent.id))) or 0
-        total_contents = await self.db.scalar(select(func.count(AgentContent.id))) or 0
-
-        content_type_counts = {}
-        for ct in [
-            "document",
-            "video",
-            "post",
-            "code",
-            "artwork",
-            "music",
-            "research",
-            "conversation",
-            "dataset",
-            "simulation",
-        ]:
-            count = (
-                await self.db.scalar(
-                    select(func.count(AgentContent.id)).where(
-                        AgentContent.content_type == ct
-                    )
-                )
-                or 0
-            )
-            content_type_counts[ct] = count
-
-        platform_stmt = (
-            select(
-                AgentContent.source_platform, func.count(AgentContent.id).label("count")
-            )
-            .where(AgentContent.source_platform.isnot(None))
-            .group_by(AgentContent.source_platform)
-            .order_by(desc("count"))
-            .limit(10)
+        # Counts come from the facet summary table in one read. content_type
+        # is NOT NULL, so the per-type counts also add up to the total
+        result = await self.db.execute(
+            select(ContentFacet.kind, ContentFacet.value, ContentFacet.count)
+            .where(ContentFacet.kind.in_(("content_type", "platform", "total")))
+            .order_by(desc(ContentFacet.count), ContentFacet.value)
         )
-        platform_result = await self.db.execute(platform_stmt)
-        top_platforms = [{"platform": p, "count": c} for p, c in platform_result.all()]
+        counts = {"content_type": {}, "platform": {}, "total": {}}
+        for kind, value, count in result.all():
+            counts[kind][value] = count
+
+        total_agents = counts["total"].get("agents", 0)
+        counts_by_type = counts["content_type"]
+        total_contents = sum(counts_by_type.values())
+        content_type_counts = {
+            ct: counts_by_type.get(ct, 0) for ct in STATS_CONTENT_TYPES
+        }
+        top_platforms = [
+            {"platform": p, "count": c}
+            for p, c in islice(counts["platform"].items(), 10)
+        ]
 
         return {
             "total_agents": total_agents,
@@ -166,40 +463,42 @@ class SearchService:
             "recent_indexed": 0,
         }
 
-    async def get_content_types(self) -> List[str]:
+    async def _facet_values(self, kind: str) -> List[str]:
         result = await self.db.execute(
-            select(AgentContent.content_type)
-            .distinct()
-            .where(AgentContent.content_type.isnot(None))
+            select(ContentFacet.value)
+            .where(ContentFacet.kind == kind)
+            .order_by(ContentFacet.value)
         )
-        return [r for r in result.scalars().all() if r]
+        return result.scalars().all()
+
+    async def get_content_types(self) -> List[str]:
+        return await self._facet_values("content_type")
 
     async def get_platforms(self) -> List[str]:
-        result = await self.db.execute(
-            select(AgentContent.source_platform)
-            .distinct()
-            .where(AgentContent.source_platform.isnot(None))
-        )
-        return [r for r in result.scalars().all() if r]
+        return await self._facet_values("platform")
 
     async def get_tags(self) -> List[str]:
-        result = await self.db.execute(select(AgentContent.tags))
-        all_tags = set()
-        for row in result.scalars().all():
-            if row:
-                all_tags.update(row)
-        return sorted(list(all_tags))
+        return await self._facet_values("tag")
 
     async def get_agent_types(self) -> List[str]:
+        return await self._facet_values("agent_type")
+
+    async def get_facets(self) -> Dict[str, List[str]]:
+        """Load every filter facet from the summary table in one query."""
+        facets = {kind: [] for kind in FACET_KEYS.values()}
         result = await self.db.execute(
-            select(Agent.agent_type).distinct().where(Agent.agent_type.isnot(None))
+            select(ContentFacet.kind, ContentFacet.value)
+            .where(ContentFacet.kind.in_(tuple(FACET_KEYS)))
+            .order_by(ContentFacet.value)
         )
-        return [r for r in result.scalars().all() if r]
+        for kind, value in result.all():
+            facets[FACET_KEYS[kind]].append(value)
+        return facets
 
     async def get_featured_content(self, limit: int = 6) -> List[AgentContent]:
         stmt = (
             select(AgentContent)
-            .options(selectinload(AgentContent.agent))
+            .options(*_JOINED_AGENT)
             .where(AgentContent.is_featured == True)
             .order_by(desc(AgentContent.quality_score))
             .limit(limit)
@@ -210,7 +509,7 @@ class SearchService:
     async def get_recent_content(self, limit: int = 12) -> List[AgentContent]:
         stmt = (
             select(AgentContent)
-            .options(selectinload(AgentContent.agent))
+            .options(*_JOINED_AGENT)
             .order_by(desc(AgentContent.indexed_at))
             .limit(limit)
         )
@@ -76,13 +76,10 @@ function setupEventListeners() {
 
 async function loadFilters() {
     try {
-        const [platforms, agentTypes] = await Promise.all([
-            fetch(`${API_BASE}/platforms`).then(r => r.json()),
-            fetch(`${API_BASE}/agent-types`).then(r => r.json())
-        ]);
+        const facets = await fetch(`${API_BASE}/facets`).then(r => r.json());
 
-        populateSelect('platformFilter', platforms, 'All Platforms');
-        populateSelect('agentTypeFilter', agentTypes, 'All Agent Types');
+        populateSelect('platformFilter', facets.platforms, 'All Platforms');
+        populateSelect('agentTypeFilter', facets.agent_types, 'All Agent Types');
     } catch (error) {
         console.error('Error loading filters:', error);
     }
@@ -163,6 +160,7 @@ async function performSearch() {
         params.append('sort_by', currentFilters.sort_by);
         params.append('page', currentFilters.page);
         params.append('page_size', currentFilters.page_size);
+        params.append('include_total', 'true');
 
         const response = await fetch(`${API_BASE}/search?${params}`);
         const data = await response.json();
@@ -2,4 +2,6 @@ if __name__ == "__main__":
     import uvicorn
     from app.main import app
 
-    uvicorn.run(app, host="127.0.0.1", port=8080)
+    # uvloop and httptools come with uvicorn[standard]. A single worker is
+    # kept because the scheduler and caches live in process.
+    uvicorn.run(app, host="127.0.0.1", port=8080, loop="auto", http="auto")